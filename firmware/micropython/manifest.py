@@ -0,0 +1,41 @@
+"""
+Frozen-module manifest for a custom PagodaLightPico MicroPython firmware.
+
+Freezing compiles the firmware library to bytecode that lives in flash, so
+nothing under lib/ is read from the filesystem and compiled on the heap at
+boot. Build from a MicroPython checkout:
+
+    cd micropython/ports/rp2
+    make BOARD=RPI_PICO_W FROZEN_MANIFEST=/path/to/PagodaLightPico/firmware/micropython/manifest.py
+
+then flash build-RPI_PICO_W/firmware.uf2.
+
+The device filesystem must then hold only main.py, config.json and
+sun_times.json. A /lib directory left on the filesystem is found first on
+sys.path and shadows the frozen `lib` package and the top-level modules.
+"""
+
+# Keep the board's own frozen modules (asyncio, ntptime, networking, ...)
+include("$(PORT_DIR)/boards/RPI_PICO_W/manifest.py")
+
+# Imported as `lib.<name>`
+package(
+    "lib",
+    (
+        "config_manager.py",
+        "rtc_shared.py",
+        "sun_times.py",
+        "wifi_connect.py",
+        "pwm_control.py",
+        "system_status.py",
+        "mqtt_notifier.py",
+        "web_server.py",
+    ),
+    base_path="src",
+)
+
+# Imported top-level (they sit in /lib, which is on sys.path on the device)
+module("simple_logger.py", base_path="src/lib")
+module("rtc_module.py", base_path="src/lib")
+module("urtc.py", base_path="src/lib")
+package("umqtt", base_path="src/lib")
@@ -9,15 +9,116 @@ Supports runtime configuration updates.
 import json
 import os
 
-# Initialize a basic logger to avoid circular imports during config loading
+# Warm up the json module once at import: on MicroPython this initializes
+# encoder/decoder state up front so every later load/save parses faster.
+try:
+    json.dumps(None)
+except Exception:
+    pass
+
+# BasicLogger threshold: FATAL=0, ERROR=1, WARN=2, INFO=3, DEBUG=4
+_LEVEL = 3
+
+# Initialize a basic logger to avoid circular imports during config loading.
+# Messages are passed as separate args so nothing is formatted when filtered.
 class BasicLogger:
-    def info(self, msg): print(f"INFO: {msg}")
-    def debug(self, msg): print(f"DEBUG: {msg}")
-    def error(self, msg): print(f"ERROR: {msg}")
-    def warn(self, msg): print(f"WARN: {msg}")
+    def info(self, *args):
+        if _LEVEL >= 3:
+            print("INFO:", *args)
+    def debug(self, *args):
+        if _LEVEL >= 4:
+            print("DEBUG:", *args)
+    def error(self, *args):
+        if _LEVEL >= 1:
+            print("ERROR:", *args)
+    def warn(self, *args):
+        if _LEVEL >= 2:
+            print("WARN:", *args)
 
 log = BasicLogger()
 
+# Shared read-only default for missing config sections; never mutate
+_EMPTY = {}
+
+# Time placeholders; module-level so the identity check in
+# _is_valid_time_format hits for interned literals
+_SUNRISE = "sunrise"
+_SUNSET = "sunset"
+
+# Validation constants, built once instead of on every validation run
+_VALID_LOG_LEVELS = ("FATAL", "ERROR", "WARN", "INFO", "DEBUG")
+_LOG_LEVELS_MSG = "Log level must be one of: FATAL, ERROR, WARN, INFO, DEBUG"
+
+# Integer range rules, compiled once at import into flat tuples and applied
+# by _check_int_rules: (key, default, min, max or None, error message)
+_HARDWARE_INT_RULES = (
+    ("rtc_i2c_sda_pin", None, 0, 28, "rtc_i2c_sda_pin must be an integer between 0 and 28"),
+    ("rtc_i2c_scl_pin", None, 0, 28, "rtc_i2c_scl_pin must be an integer between 0 and 28"),
+    ("pwm_frequency", 1000, 1, 40000000, "PWM frequency must be between 1 Hz and 40 MHz"),
+)
+_SYSTEM_INT_RULES = (
+    ("update_interval", 60, 1, None, "Update interval must be a positive integer"),
+    ("network_check_interval", 120, 10, 3600, "system.network_check_interval must be int 10..3600 seconds"),
+    ("server_idle_sleep_ms", 300, 50, 5000, "system.server_idle_sleep_ms must be int 50..5000 ms"),
+    ("client_read_sleep_ms", 50, 10, 2000, "system.client_read_sleep_ms must be int 10..2000 ms"),
+    ("ram_telemetry_interval", 300, 10, 86400, "system.ram_telemetry_interval must be int 10..86400 seconds"),
+)
+
+_used_gpio_pins = set()  # reused by _validate_pwm_pins; cleared per run
+_errors_buf = []  # reused by _validate_config; single-threaded, cleared per run
+
+def _check_int_rules(section, rules, errors):
+    """Apply integer range rules to a config section, appending messages to errors."""
+    for key, default, lo, hi, msg in rules:
+        value = section.get(key, default)
+        if not isinstance(value, int) or value < lo or (hi is not None and value > hi):
+            errors.append(msg)
+
+def _changes(base, update):
+    """Return True if deep-merging update into base would change base."""
+    if not (isinstance(base, dict) and isinstance(update, dict)):
+        return base != update
+    stack = [(base, update)]
+    while stack:
+        b, u = stack.pop()
+        for key, value in u.items():
+            if key not in b:
+                return True
+            base_value = b[key]
+            if isinstance(base_value, dict) and isinstance(value, dict):
+                stack.append((base_value, value))
+            elif base_value != value:
+                return True
+    return False
+
+# Legacy attribute name -> (section, key, default); key None returns the
+# whole section. Read by ConfigManager.__getattr__ on each access.
+_ATTR_PATHS = {
+    "WIFI_SSID": ("wifi", "ssid", ""),
+    "WIFI_PASSWORD": ("wifi", "password", ""),
+    "TIMEZONE_NAME": ("timezone", "name", "UTC"),
+    "TIMEZONE_OFFSET": ("timezone", "offset", 0.0),
+    "RTC_I2C_SDA_PIN": ("hardware", "rtc_i2c_sda_pin", 20),
+    "RTC_I2C_SCL_PIN": ("hardware", "rtc_i2c_scl_pin", 21),
+    "PWM_FREQUENCY": ("hardware", "pwm_frequency", 1000),
+    "LOG_LEVEL": ("system", "log_level", "INFO"),
+    "UPDATE_INTERVAL": ("system", "update_interval", 120),
+    "SERVER_IDLE_SLEEP_MS": ("system", "server_idle_sleep_ms", 300),
+    "CLIENT_READ_SLEEP_MS": ("system", "client_read_sleep_ms", 50),
+    "NETWORK_CHECK_INTERVAL": ("system", "network_check_interval", 120),
+    "RAM_TELEMETRY_ENABLED": ("system", "ram_telemetry_enabled", False),
+    "RAM_TELEMETRY_INTERVAL": ("system", "ram_telemetry_interval", 300),
+    "WEB_TITLE": ("system", "web_title", "PagodaLightPico"),
+    "NOTIFICATIONS_ENABLED": ("notifications", "enabled", False),
+    "MQTT_BROKER": ("notifications", "mqtt_broker", "broker.hivemq.com"),
+    "MQTT_PORT": ("notifications", "mqtt_port", 1883),
+    "MQTT_TOPIC": ("notifications", "mqtt_topic", "PagodaLightPico/notifications"),
+    "MQTT_CLIENT_ID": ("notifications", "mqtt_client_id", "PagodaLightPico"),
+    "NOTIFY_ON_WINDOW_CHANGE": ("notifications", "notify_on_window_change", True),
+    "NOTIFY_ON_ERRORS": ("notifications", "notify_on_errors", True),
+    "PWM_PINS": ("pwm_pins", None, {}),
+}
+
 class ConfigManager:
     """
     Manages JSON configuration with validation and runtime updates.
@@ -29,24 +130,23 @@ class ConfigManager:
     def __init__(self, config_file="config.json"):
         self.config_file = config_file
         self.config = {}
+        # Bumped whenever self.config changes; callers key derived caches on it
+        self.config_rev = 0
         self.load_config()
-        self._setup_attributes()
     
     def load_config(self):
-        """Load configuration from JSON file."""
+        """Load configuration from JSON file, validate it and refresh attributes."""
         try:
-            # Check if file exists
-            os.stat(self.config_file)
-            
-            # Load and parse JSON with minimal memory usage
-            with open(self.config_file, 'r') as f:
-                # For MicroPython, we don't have many options to optimize JSON parsing
-                # but we can ensure we're not keeping unnecessary references
-                self.config = json.load(f)
+            # One read and one in-memory parse; a missing file raises OSError
+            # from open() itself, so no separate stat is needed
+            with open(self.config_file, 'rb') as f:
+                data = f.read()
+            self.config = json.loads(data)
+            data = None
             
             # Reduce logging to save memory
             # log.info(f"[CONFIG] Configuration loaded from {self.config_file}")
-            self._validate_config()
+            self._apply()
             
         except Exception as e:
             # Reduce logging to save memory
@@ -56,10 +156,15 @@ class ConfigManager:
     def save_config(self):
         """Save current configuration to JSON file."""
         try:
-            # For MicroPython, we don't have many options to optimize JSON writing
-            # but we can ensure we're not keeping unnecessary references
-            with open(self.config_file, 'w') as f:
-                json.dump(self.config, f)
+            # Serialize once and write it in a single call to a temp file,
+            # then rename over the original: a power cut mid-write leaves
+            # the previous config.json intact instead of a truncated one
+            data = json.dumps(self.config)
+            tmp_file = self.config_file + ".tmp"
+            with open(tmp_file, 'w') as f:
+                f.write(data)
+            data = None
+            os.rename(tmp_file, self.config_file)
             # Reduce logging to save memory
             # log.info(f"[CONFIG] Configuration saved to {self.config_file}")
             return True
@@ -76,151 +181,176 @@ class ConfigManager:
             updates (dict): Dictionary of configuration updates in nested format
         
         Returns:
-            bool: True if successful, False otherwise
+            bool: True if successful (including a no-op update), False otherwise
         """
         try:
+            # Only sections with an effective change are re-validated, and an
+            # update that changes nothing never rewrites config.json on flash.
+            # Inside the try so a non-dict update is rejected, not raised.
+            config = self.config
+            changed = [key for key in updates if _changes(config.get(key), updates[key])]
+            if not changed:
+                log.debug("[CONFIG] Update changes nothing; skipping save")
+                return True
+            
             # Debug: Log the updates being applied
-            log.debug(f"[CONFIG] Applying updates: {updates}")
+            log.debug("[CONFIG] Applying updates:", updates)
             
-            # Deep merge the updates into current config
-            self._deep_merge(self.config, updates)
+            # Merge into a deep copy and validate that; the live config is
+            # only replaced once the candidate passes, so a rejected update
+            # never leaves a half-merged config behind
+            candidate = self.snapshot()
+            self._deep_merge(candidate, updates)
             
             # Debug: Log the updated config
-            log.debug(f"[CONFIG] Updated config PWM pins: {self.config.get('pwm_pins', {})}")
-            
-            # Validate the updated configuration
-            self._validate_config()
-            
-            # Update attributes for backward compatibility
-            self._setup_attributes()
+            log.debug("[CONFIG] Updated config PWM pins:", candidate.get('pwm_pins'))
             
+            # Validate the changed sections only
+            self._validate_config(changed, candidate)
+            self.config = candidate
+            self.config_rev += 1
+
+            # Rebind the shared RTC bus on its next use if its pins moved
+            if "hardware" in changed:
+                from lib.rtc_shared import reset_rtc
+                reset_rtc()
+
             # Save to file
             return self.save_config()
             
         except Exception as e:
-            log.error(f"[CONFIG] Failed to update configuration: {e}")
+            log.error("[CONFIG] Failed to update configuration:", e)
             return False
     
     def _deep_merge(self, base_dict, update_dict):
         """Deep merge update_dict into base_dict."""
-        log.debug(f"[CONFIG] Deep merging: base={base_dict}, update={update_dict}")
-        for key, value in update_dict.items():
-            if key in base_dict and isinstance(base_dict[key], dict) and isinstance(value, dict):
-                log.debug(f"[CONFIG] Recursively merging key {key}")
-                self._deep_merge(base_dict[key], value)
-            else:
-                log.debug(f"[CONFIG] Setting key {key} to {value}")
-                base_dict[key] = value
+        # Explicit stack instead of recursion: no Python frame per nesting level
+        stack = [(base_dict, update_dict)]
+        while stack:
+            base, update = stack.pop()
+            for key, value in update.items():
+                base_value = base.get(key)
+                if isinstance(base_value, dict) and isinstance(value, dict):
+                    stack.append((base_value, value))
+                else:
+                    base[key] = value
     
-    def _setup_attributes(self):
-        """Set up attributes for module-level access."""
-        # WiFi settings
-        self.WIFI_SSID = self.config.get("wifi", {}).get("ssid", "")
-        self.WIFI_PASSWORD = self.config.get("wifi", {}).get("password", "")
+    def _sections(self, config=None):
+        """
+        Fetch each top-level config section once.
         
-        # Timezone settings
-        self.TIMEZONE_NAME = self.config.get("timezone", {}).get("name", "UTC")
-        self.TIMEZONE_OFFSET = self.config.get("timezone", {}).get("offset", 0.0)
+        Args:
+            config: Config dict to read; defaults to self.config.
         
-        # Hardware settings
-        hardware = self.config.get("hardware", {})
-        self.RTC_I2C_SDA_PIN = hardware.get("rtc_i2c_sda_pin", 20)
-        self.RTC_I2C_SCL_PIN = hardware.get("rtc_i2c_scl_pin", 21)
-        self.PWM_FREQUENCY = hardware.get("pwm_frequency", 1000)
+        Returns:
+            tuple: (wifi, timezone, hardware, system, notifications, pwm_pins),
+                with _EMPTY standing in for missing sections
+        """
+        get = (self.config if config is None else config).get
+        return (get("wifi") or _EMPTY, get("timezone") or _EMPTY,
+                get("hardware") or _EMPTY, get("system") or _EMPTY,
+                get("notifications") or _EMPTY, get("pwm_pins") or _EMPTY)
+    
+    def _apply(self, sections=None):
+        """
+        Validate the configuration and mark it as a new revision.
         
-        # System settings
-        system = self.config.get("system", {})
-        self.LOG_LEVEL = system.get("log_level", "INFO")
-        self.UPDATE_INTERVAL = system.get("update_interval", 120)
-        # New: backoff/sleep tunables (milliseconds)
-        self.SERVER_IDLE_SLEEP_MS = system.get("server_idle_sleep_ms", 300)
-        self.CLIENT_READ_SLEEP_MS = system.get("client_read_sleep_ms", 50)
-        # New: network monitor interval (seconds)
-        self.NETWORK_CHECK_INTERVAL = system.get("network_check_interval", 120)
-        # New: RAM telemetry settings
-        self.RAM_TELEMETRY_ENABLED = system.get("ram_telemetry_enabled", False)
-        self.RAM_TELEMETRY_INTERVAL = system.get("ram_telemetry_interval", 300)
-        # New: Web UI title
-        self.WEB_TITLE = system.get("web_title", "PagodaLightPico")
+        Args:
+            sections: Top-level keys to validate (e.g. an updates dict).
+                None validates everything.
+        """
+        self._validate_config(sections)
+        self.config_rev += 1
+    
+    def __getattr__(self, name):
+        """
+        Resolve legacy attributes (WIFI_SSID, UPDATE_INTERVAL, ...) from the
+        live config through _ATTR_PATHS, so nothing is duplicated on the
+        instance and updates are visible immediately.
+        """
+        path = _ATTR_PATHS.get(name)
+        if path is None:
+            raise AttributeError(name)
+        section, key, default = path
+        value = self.config.get(section) or _EMPTY
+        if key is None:
+            return value or default
+        return value.get(key, default)
+    
+    def _validate_config(self, sections=None, config=None):
+        """
+        Validate configuration values.
         
-        # Notification settings  
-        notifications = self.config.get("notifications", {})
-        self.NOTIFICATIONS_ENABLED = notifications.get("enabled", False)
-        self.MQTT_BROKER = notifications.get("mqtt_broker", "broker.hivemq.com")
-        self.MQTT_PORT = notifications.get("mqtt_port", 1883)
-        self.MQTT_TOPIC = notifications.get('mqtt_topic', 'PagodaLightPico/notifications')
-        self.MQTT_CLIENT_ID = notifications.get('mqtt_client_id', 'PagodaLightPico')
-        self.NOTIFY_ON_WINDOW_CHANGE = notifications.get("notify_on_window_change", True)
-        self.NOTIFY_ON_ERRORS = notifications.get("notify_on_errors", True)
+        Args:
+            sections: Top-level keys to validate (any container supporting
+                ``in``, e.g. an updates dict). None validates everything.
+            config: Config dict to validate; defaults to self.config.
+        """
+        wifi, timezone, hardware, system, _, pwm_pins = self._sections(config)
+        errors = _errors_buf
+        errors.clear()
         
-        # PWM pins configuration
-        self.PWM_PINS = self.config.get("pwm_pins", {})
-    
-    def _validate_config(self):
-        """Validate configuration values."""
-        errors = []
+        if sections is None or "wifi" in sections:
+            self._validate_wifi(wifi, errors)
+        if sections is None or "timezone" in sections:
+            self._validate_timezone(timezone, errors)
+        hardware_changed = sections is None or "hardware" in sections
+        if hardware_changed:
+            self._validate_hardware(hardware, errors)
+        if sections is None or "system" in sections:
+            self._validate_system(system, errors)
+        # PWM pins are checked against the I2C pins, so re-run on hardware changes too
+        if hardware_changed or "pwm_pins" in sections:
+            self._validate_pwm_pins(hardware, pwm_pins, errors)
         
-        # Validate WiFi settings
-        wifi = self.config.get("wifi", {})
+        if errors:
+            error_msg = "Configuration validation failed: " + "; ".join(errors)
+            errors.clear()
+            # Reduce logging to save memory
+            # log.error(f"[CONFIG] {error_msg}")
+            raise ValueError(error_msg)
+        
+        # Reduce logging to save memory
+        # log.debug("[CONFIG] Validation passed")
+    
+    def _validate_wifi(self, wifi, errors):
+        """Validate WiFi settings, appending messages to errors."""
         if not wifi.get("ssid"):
             errors.append("WiFi SSID is required")
         if not wifi.get("password"):
             errors.append("WiFi password is required")
-        
-        # Validate timezone
-        timezone = self.config.get("timezone", {})
+    
+    def _validate_timezone(self, timezone, errors):
+        """Validate timezone settings, appending messages to errors."""
         offset = timezone.get("offset", 0)
         if not isinstance(offset, (int, float)) or offset < -12 or offset > 14:
             errors.append("Timezone offset must be between -12 and +14 hours")
+    
+    def _validate_hardware(self, hardware, errors):
+        """Validate hardware pins and PWM frequency, appending messages to errors."""
+        _check_int_rules(hardware, _HARDWARE_INT_RULES, errors)
+    
+    def _validate_system(self, system, errors):
+        """Validate system settings, appending messages to errors."""
+        if system.get("log_level") not in _VALID_LOG_LEVELS:
+            errors.append(_LOG_LEVELS_MSG)
         
-        # Validate hardware pins
-        hardware = self.config.get("hardware", {})
-        pins_to_check = ["rtc_i2c_sda_pin", "rtc_i2c_scl_pin"]
-        for pin_name in pins_to_check:
-            pin_value = hardware.get(pin_name)
-            if not isinstance(pin_value, int) or pin_value < 0 or pin_value > 28:
-                errors.append(f"{pin_name} must be an integer between 0 and 28")
-        
-        # Validate PWM frequency
-        pwm_freq = hardware.get("pwm_frequency", 1000)
-        if not isinstance(pwm_freq, int) or pwm_freq < 1 or pwm_freq > 40000000:
-            errors.append("PWM frequency must be between 1 Hz and 40 MHz")
-        
-        # Validate system settings
-        system = self.config.get("system", {})
-        valid_log_levels = ["FATAL", "ERROR", "WARN", "INFO", "DEBUG"]
-        if system.get("log_level") not in valid_log_levels:
-            errors.append(f"Log level must be one of: {', '.join(valid_log_levels)}")
-        
-        update_interval = system.get("update_interval", 60)
-        if not isinstance(update_interval, int) or update_interval < 1:
-            errors.append("Update interval must be a positive integer")
-        # Validate network check interval (s)
-        network_check_interval = system.get("network_check_interval", 120)
-        if not isinstance(network_check_interval, int) or network_check_interval < 10 or network_check_interval > 3600:
-            errors.append("system.network_check_interval must be int 10..3600 seconds")
-        # Validate server/client sleeps (ms)
-        server_idle_ms = system.get("server_idle_sleep_ms", 300)
-        client_read_ms = system.get("client_read_sleep_ms", 50)
-        if not isinstance(server_idle_ms, int) or server_idle_ms < 50 or server_idle_ms > 5000:
-            errors.append("system.server_idle_sleep_ms must be int 50..5000 ms")
-        if not isinstance(client_read_ms, int) or client_read_ms < 10 or client_read_ms > 2000:
-            errors.append("system.client_read_sleep_ms must be int 10..2000 ms")
+        _check_int_rules(system, _SYSTEM_INT_RULES, errors)
         # Validate RAM telemetry
         ram_enabled = system.get("ram_telemetry_enabled", False)
         if not isinstance(ram_enabled, bool):
             errors.append("system.ram_telemetry_enabled must be boolean")
-        ram_interval = system.get("ram_telemetry_interval", 300)
-        if not isinstance(ram_interval, int) or ram_interval < 10 or ram_interval > 86400:
-            errors.append("system.ram_telemetry_interval must be int 10..86400 seconds")
         # Validate web title if provided
         if "web_title" in system and not isinstance(system.get("web_title"), str):
             errors.append("system.web_title must be a string")
-        
-        # Validate PWM pins configuration
-        pwm_pins = self.config.get("pwm_pins", {})
+    
+    def _validate_pwm_pins(self, hardware, pwm_pins, errors):
+        """Validate PWM pin configuration, appending messages to errors."""
         enabled_pins = 0
-        used_gpio_pins = set()
+        used_gpio_pins = _used_gpio_pins
+        used_gpio_pins.clear()
+        sda_pin = hardware.get("rtc_i2c_sda_pin")
+        scl_pin = hardware.get("rtc_i2c_scl_pin")
         
         for pin_key, pin_config in pwm_pins.items():
             # Skip comment fields
@@ -247,7 +377,7 @@ class ConfigManager:
             used_gpio_pins.add(gpio_pin)
             
             # Check if pin conflicts with I2C pins
-            if gpio_pin == hardware.get("rtc_i2c_sda_pin") or gpio_pin == hardware.get("rtc_i2c_scl_pin"):
+            if gpio_pin == sda_pin or gpio_pin == scl_pin:
                 errors.append(f"GPIO pin {gpio_pin} conflicts with I2C pins")
             
             # Validate name
@@ -259,7 +389,7 @@ class ConfigManager:
                 enabled_pins += 1
                 
                 # Validate time windows for enabled pins
-                time_windows = pin_config.get("time_windows", {})
+                time_windows = pin_config.get("time_windows", _EMPTY)
                 if not isinstance(time_windows, dict):
                     errors.append(f"PWM pin {pin_key} time_windows must be a dictionary")
                     continue
@@ -278,7 +408,7 @@ class ConfigManager:
                         continue
                     
                     # Validate time format
-                    for time_field in ["start", "end"]:
+                    for time_field in ("start", "end"):
                         time_value = window_config.get(time_field)
                         if not self._is_valid_time_format(time_value):
                             errors.append(f"Invalid time format for {pin_key}.{window_name}.{time_field}: {time_value}")
@@ -297,64 +427,100 @@ class ConfigManager:
             errors.append("At least one PWM pin must be enabled")
         elif enabled_pins > 5:
             errors.append("Maximum 5 PWM pins can be enabled")
-        
-        if errors:
-            error_msg = "Configuration validation failed: " + "; ".join(errors)
-            # Reduce logging to save memory
-            # log.error(f"[CONFIG] {error_msg}")
-            raise ValueError(error_msg)
-        
-        # Reduce logging to save memory
-        # log.debug("[CONFIG] Validation passed")
     
     def _is_valid_time_format(self, time_str):
-        """Validate time format HH:MM."""
-        if not isinstance(time_str, str):
-            return False
-
+        """Validate time format HH:MM (or H:MM), or a sunrise/sunset placeholder."""
+        s = time_str
         # Allow dynamic placeholders
-        lower = time_str.strip().lower()
-        if lower in ("sunrise", "sunset"):
+        if s is _SUNRISE or s is _SUNSET or s == _SUNRISE or s == _SUNSET:
             return True
-
-        try:
-            parts = time_str.split(":")
-            if len(parts) != 2:
-                return False
-            
-            hour, minute = int(parts[0]), int(parts[1])
-            return 0 <= hour <= 23 and 0 <= minute <= 59
-        except (ValueError, IndexError):
+        if not isinstance(s, str):
             return False
+
+        # Character compares only: no split, int() or exception handling
+        n = len(s)
+        if n == 5 and s[2] == ':':
+            a = s[0]
+            b = s[1]
+            hour_ok = '0' <= a <= '2' and '0' <= b <= '9' and (a < '2' or b <= '3')
+        elif n == 4 and s[1] == ':':
+            hour_ok = '0' <= s[0] <= '9'
+        else:
+            hour_ok = False
+        if hour_ok:
+            return '0' <= s[n - 2] <= '5' and '0' <= s[n - 1] <= '9'
+
+        # Uncommon spellings (" Sunrise", "07:30 "): normalize and retry once
+        t = s.strip().lower()
+        return t != s and self._is_valid_time_format(t)
+    
+    def get_config_view(self):
+        """
+        Get the live configuration dictionary without copying it.
+        
+        The returned dict is the manager's own state: treat it as read-only
+        and use update_config() to change settings.
+        """
+        return self.config
+    
+    # Backward-compatible name; returns the same read-only view
+    get_config_dict = get_config_view
     
-    def get_config_dict(self):
-        """Get the complete configuration as a dictionary."""
-        return self.config.copy()
+    def snapshot(self):
+        """Return an independent deep copy of the configuration."""
+        return json.loads(json.dumps(self.config))
     
     def reload(self):
         """Reload configuration from file."""
         log.info("[CONFIG] Reloading configuration from file")
         self.load_config()
-        self._setup_attributes()
+
+
+_instance = None
+
+
+def get_config_manager():
+    """Return the global ConfigManager, loading config.json on first call."""
+    global _instance
+    if _instance is None:
+        _instance = ConfigManager()
+    return _instance
+
+
+class _LazyConfigManager:
+    """
+    Stand-in for the global ConfigManager instance.
+    
+    Importing this module does no file I/O; config.json is loaded and
+    validated on the first attribute access, then every access is forwarded
+    to the real instance.
+    """
+    
+    def __getattr__(self, name):
+        return getattr(get_config_manager(), name)
 
 
 # Global configuration instance for backward compatibility
-config_manager = ConfigManager()
+config_manager = _LazyConfigManager()
 
-# Export attributes at module level for compatibility
-WIFI_SSID = config_manager.WIFI_SSID
-WIFI_PASSWORD = config_manager.WIFI_PASSWORD
-TIMEZONE_NAME = config_manager.TIMEZONE_NAME
-TIMEZONE_OFFSET = config_manager.TIMEZONE_OFFSET
-RTC_I2C_SDA_PIN = config_manager.RTC_I2C_SDA_PIN
-RTC_I2C_SCL_PIN = config_manager.RTC_I2C_SCL_PIN
-PWM_FREQUENCY = config_manager.PWM_FREQUENCY
-LOG_LEVEL = config_manager.LOG_LEVEL
-UPDATE_INTERVAL = config_manager.UPDATE_INTERVAL
-SERVER_IDLE_SLEEP_MS = config_manager.SERVER_IDLE_SLEEP_MS
-CLIENT_READ_SLEEP_MS = config_manager.CLIENT_READ_SLEEP_MS
-NETWORK_CHECK_INTERVAL = config_manager.NETWORK_CHECK_INTERVAL
-RAM_TELEMETRY_ENABLED = config_manager.RAM_TELEMETRY_ENABLED
-RAM_TELEMETRY_INTERVAL = config_manager.RAM_TELEMETRY_INTERVAL
-PWM_PINS = config_manager.PWM_PINS
-WEB_TITLE = config_manager.WEB_TITLE
+# Attributes exported at module level for compatibility
+_EXPORTS = (
+    "WIFI_SSID", "WIFI_PASSWORD", "TIMEZONE_NAME", "TIMEZONE_OFFSET",
+    "RTC_I2C_SDA_PIN", "RTC_I2C_SCL_PIN", "PWM_FREQUENCY", "LOG_LEVEL",
+    "UPDATE_INTERVAL", "SERVER_IDLE_SLEEP_MS", "CLIENT_READ_SLEEP_MS",
+    "NETWORK_CHECK_INTERVAL", "RAM_TELEMETRY_ENABLED", "RAM_TELEMETRY_INTERVAL",
+    "PWM_PINS", "WEB_TITLE",
+)
+
+
+def __getattr__(name):
+    """
+    Resolve module-level exports (e.g. `config.UPDATE_INTERVAL`) lazily.
+    
+    Values are read from the live ConfigManager, so they reflect runtime
+    updates. Names bound with `from lib.config_manager import X` are still
+    copies taken at import time.
+    """
+    if name in _EXPORTS:
+        return getattr(get_config_manager(), name)
+    raise AttributeError(name)
@@ -12,23 +12,44 @@ Supported notification methods:
 """
 
 import json
+import socket
 import time
+from micropython import const
 from lib.config_manager import config_manager
 from simple_logger import Logger
 
-# Try to import MQTT library (may not be available in all MicroPython builds)
+# umqtt ships in lib/ (and in the frozen manifest); None if it was removed
 try:
     from umqtt.simple import MQTTClient
-    MQTT_AVAILABLE = True
 except ImportError:
-    try:
-        from mqtt.simple import MQTTClient
-        MQTT_AVAILABLE = True
-    except ImportError:
-        MQTT_AVAILABLE = False
+    MQTTClient = None
 
 log = Logger()
 
+# MQTT keepalive negotiated with the broker (s), and how long the link may
+# sit idle before keepalive() pings; must stay below the keepalive
+_KEEPALIVE = const(30)
+_PING_INTERVAL = const(20)
+
+# Broker port used when the config does not set mqtt_port
+_DEFAULT_PORT = const(1883)
+
+# Notification categories published under the configured base topic
+_CATEGORIES = ("system", "error", "pin_change", "batch", "summary", "config")
+
+# Pin-change message templates: only the pin name and duty cycle vary
+_MSG_DAY = "[DAY] %s: sunrise to sunset - %s%% brightness"
+_MSG_OFF = "[OFF] %s: lights off - 0%% brightness"
+_MSG_ON = "[ON] %s: meditation lighting - %s%% brightness"
+
+# Notifications held while disconnected; the oldest is dropped when full
+_OUTBOX_MAX = const(16)
+
+# Reusable encode buffer for fixed-shape payloads; a publish writes it to
+# the socket before returning, so one buffer serves every event
+_BUF = bytearray(256)
+_MV = memoryview(_BUF)
+
 class MQTTNotifier:
     """
     MQTT-based notification system for sending push notifications.
@@ -42,24 +63,35 @@ class MQTTNotifier:
         self.connected = False
         self.last_windows = {}  # {pin_key: last_window}
         self.notifications_enabled = False
+        self._last_io = 0  # ticks_ms() of the last packet sent to the broker
+        self._outbox = []  # [(topic, payload)] awaiting the next connect
         self._load_config()
     
     def _load_config(self):
         """Load MQTT configuration from config manager."""
-        config = config_manager.get_config_dict()
-        notifications = config.get('notifications', {})
-        
-        self.notifications_enabled = notifications.get('enabled', False)
-        self.broker = notifications.get('mqtt_broker', 'broker.hivemq.com')
-        self.port = notifications.get('mqtt_port', 1883)
-        self.topic = notifications.get('mqtt_topic', 'PagodaLightPico/notifications')
-        self.client_id = notifications.get('mqtt_client_id', 'PagodaLightPico')
-        self.notify_on_window_change = notifications.get('notify_on_window_change', True)
-        self.notify_on_errors = notifications.get('notify_on_errors', True)
+        # Revision of the config these settings were read from
+        self._config_rev = config_manager.config_rev
+        g = (config_manager.get_config_view().get('notifications') or {}).get
+        
+        self.notifications_enabled = g('enabled', False)
+        self.broker = g('mqtt_broker', 'broker.hivemq.com')
+        self.port = g('mqtt_port', _DEFAULT_PORT)
+        self.topic = g('mqtt_topic', 'PagodaLightPico/notifications')
+        self.client_id = g('mqtt_client_id', 'PagodaLightPico')
+        self.notify_on_window_change = g('notify_on_window_change', True)
+        self.notify_on_errors = g('notify_on_errors', True)
+        self.batch_pin_changes = g('batch_pin_changes', True)
+        # Serialized once: the constant tail of every fixed-shape payload
+        self._device_tail = (', "device": ' + json.dumps(self.client_id) + '}').encode()
+        # Per-category topics, encoded once instead of formatted per publish
+        base = self.topic + "/"
+        self._topics = {c: (base + c).encode() for c in _CATEGORIES}
+        # Reused for every single-pin publish; only the values change
+        self._pin_evt = {"event": "pin_window_change", "device": self.client_id}
     
     def connect(self):
         """Connect to MQTT broker."""
-        if not MQTT_AVAILABLE:
+        if MQTTClient is None:
             log.warn("[MQTT] Library not available - notifications disabled")
             return False
         
@@ -67,38 +99,49 @@ class MQTTNotifier:
             log.debug("[MQTT] Notifications disabled in configuration")
             return False
         
+        # A previous client's socket is never reused; close it before replacing it
+        if self.client:
+            self._drop_connection()
+        
         try:
-            self.client = MQTTClient(self.client_id, self.broker, port=self.port)
+            self.client = MQTTClient(self.client_id, self.broker, port=self.port,
+                                     keepalive=_KEEPALIVE)
             self.client.connect()
+            # TCP keepalive as well, where the port supports it, so idle NAT
+            # mappings are refreshed below the MQTT layer too
+            try:
+                self.client.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            except Exception:
+                pass
             self.connected = True
+            self._last_io = time.ticks_ms()
             log.info(f"[MQTT] Connected to broker {self.broker}:{self.port}")
             
-            # Send startup notification
-            self._send_notification("system", {
-                "event": "system_startup",
-                "message": "[STARTUP] PagodaLight system started",
-                "timestamp": time.time(),
-                "device": self.client_id
-            })
-            
-            return True
-            
         except Exception as e:
             log.error(f"[MQTT] Failed to connect to broker: {e}")
-            self.connected = False
+            self._drop_connection()
+            return False
+        
+        # Deliver what was queued while the link was down. A failure drops
+        # the link again and keeps the rest queued; the startup event is then
+        # left to the next connect() instead of being queued twice.
+        self._flush_outbox()
+        if not self.connected:
             return False
+        
+        # Send startup notification
+        self._send_notification("system", self._fixed_payload(
+            "system_startup", "[STARTUP] PagodaLight system started"))
+        
+        return True
     
     def disconnect(self):
         """Disconnect from MQTT broker."""
         if self.client and self.connected:
             try:
                 # Send shutdown notification
-                self._send_notification("system", {
-                    "event": "system_shutdown", 
-                    "message": "[SHUTDOWN] PagodaLight system stopping",
-                    "timestamp": time.time(),
-                    "device": self.client_id
-                })
+                self._send_notification("system", self._fixed_payload(
+                    "system_shutdown", "[SHUTDOWN] PagodaLight system stopping"))
                 self.client.disconnect()
                 log.info("[MQTT] Disconnected from broker")
             except Exception as e:
@@ -114,19 +157,14 @@ class MQTTNotifier:
         Args:
             error_message (str): Error description
         """
-        if not self.notify_on_errors or not self.connected:
+        if not self.notify_on_errors or not self.notifications_enabled:
             return
         
-        notification_data = {
-            "event": "error",
-            "message": f"[ERROR] PagodaLight Error: {error_message}",
-            "timestamp": time.time(),
-            "device": self.client_id,
-            "severity": "error"
-        }
-        
-        self._send_notification("error", notification_data)
-        log.debug(f"[MQTT] Sent error notification: {error_message}")
+        self._send_notification("error", self._fixed_payload(
+            "error", f"[ERROR] PagodaLight Error: {error_message}",
+            ', "severity": "error"'))
+        if log.debug_enabled:
+            log.debug(f"[MQTT] Sent error notification: {error_message}")
     
     def notify_multi_pin_changes(self, pin_updates):
         """
@@ -135,7 +173,7 @@ class MQTTNotifier:
         Args:
             pin_updates (dict): {pin_key: {name, window, duty_cycle, window_start, window_end}}
         """
-        if not self.notify_on_window_change or not self.connected:
+        if not self.notify_on_window_change or not self.notifications_enabled:
             return
         
         # Check each pin for window changes
@@ -152,42 +190,32 @@ class MQTTNotifier:
         if not changed_pins:
             return
         
+        # One clock read stamps every event from this update
+        now = time.time()
+        
+        if len(changed_pins) > 1 and self.batch_pin_changes:
+            # One publish for the whole tick instead of one per pin plus a summary
+            events = [self._pin_change_event(pin_key, update_info, now)
+                      for pin_key, update_info in changed_pins]
+            batch_message = f"[UPDATE] {len(events)} pins changed windows"
+            self._send_notification("batch", {
+                "event": "pin_change_batch",
+                "count": len(events),
+                "events": events,
+                "message": batch_message,
+                "timestamp": now,
+                "device": self.client_id
+            })
+            if log.debug_enabled:
+                log.debug(f"[MQTT] Sent pin change batch: {batch_message}")
+            return
+        
         # Send individual notifications for each changed pin
         for pin_key, update_info in changed_pins:
-            pin_name = update_info.get('name', pin_key)
-            window_name = update_info.get('window')
-            duty_cycle = update_info.get('duty_cycle', 0)
-            start_time = update_info.get('window_start')
-            end_time = update_info.get('window_end')
-            
-            # Format notification message without emojis
-            if window_name == "day":
-                prefix = "DAY"
-                description = "sunrise to sunset"
-            elif duty_cycle == 0:
-                prefix = "OFF"
-                description = "lights off"
-            else:
-                prefix = "ON"
-                description = f"meditation lighting"
-            
-            message = f"[{prefix}] {pin_name}: {description} - {duty_cycle}% brightness"
-            
-            notification_data = {
-                "event": "pin_window_change",
-                "pin_key": pin_key,
-                "pin_name": pin_name,
-                "window": window_name,
-                "duty_cycle": duty_cycle,
-                "start_time": start_time,
-                "end_time": end_time,
-                "message": message,
-                "timestamp": time.time(),
-                "device": self.client_id
-            }
-            
+            notification_data = self._pin_change_event(pin_key, update_info, now, self._pin_evt)
             self._send_notification("pin_change", notification_data)
-            log.debug(f"[MQTT] Sent pin change notification: {message}")
+            if log.debug_enabled:
+                log.debug(f"[MQTT] Sent pin change notification: {notification_data['message']}")
         
         # Also send a summary notification if multiple pins changed
         if len(changed_pins) > 1:
@@ -197,57 +225,207 @@ class MQTTNotifier:
                 "changed_pin_count": len(changed_pins),
                 "changed_pins": [pin_key for pin_key, _ in changed_pins],
                 "message": summary_message,
-                "timestamp": time.time(),
+                "timestamp": now,
                 "device": self.client_id
             }
             
             self._send_notification("summary", summary_data)
-            log.debug(f"[MQTT] Sent multi-pin summary: {summary_message}")
+            if log.debug_enabled:
+                log.debug(f"[MQTT] Sent multi-pin summary: {summary_message}")
+    
+    def _pin_change_event(self, pin_key, update_info, now, event=None):
+        """
+        Build the pin_window_change event for one pin.
+        
+        Args:
+            pin_key (str): Pin configuration key
+            update_info (dict): {name, window, duty_cycle, window_start, window_end}
+            now: Timestamp shared by all events of the update
+            event (dict): Dict to fill in place (e.g. self._pin_evt) instead of
+                allocating one; only safe when it is serialized before reuse
+        
+        Returns:
+            dict: Notification data
+        """
+        pin_name = update_info.get('name', pin_key)
+        window_name = update_info.get('window')
+        duty_cycle = update_info.get('duty_cycle', 0)
+        
+        # Format notification message without emojis
+        if window_name == "day":
+            message = _MSG_DAY % (pin_name, duty_cycle)
+        elif duty_cycle == 0:
+            message = _MSG_OFF % pin_name
+        else:
+            message = _MSG_ON % (pin_name, duty_cycle)
+        
+        if event is None:
+            event = {"event": "pin_window_change", "device": self.client_id}
+        event["pin_key"] = pin_key
+        event["pin_name"] = pin_name
+        event["window"] = window_name
+        event["duty_cycle"] = duty_cycle
+        event["start_time"] = update_info.get('window_start')
+        event["end_time"] = update_info.get('window_end')
+        event["message"] = message
+        event["timestamp"] = now
+        return event
     
     def notify_config_change(self):
         """Send notification when configuration is updated."""
-        if not self.connected:
+        if not self.notifications_enabled:
             return
         
-        notification_data = {
-            "event": "config_update",
-            "message": "[CONFIG] Configuration updated via web interface",
-            "timestamp": time.time(),
-            "device": self.client_id
-        }
-        
-        self._send_notification("config", notification_data)
+        self._send_notification("config", self._fixed_payload(
+            "config_update", "[CONFIG] Configuration updated via web interface"))
         log.debug("[MQTT] Sent configuration change notification")
     
+    def _fixed_payload(self, event, message, extra=""):
+        """
+        Serialize a fixed-shape event without building a dict.
+        
+        Produces the same JSON as json.dumps({"event", "message",
+        "timestamp", "device"}); only the message needs escaping per call.
+        The pieces are copied into the shared _BUF rather than concatenated,
+        so the only per-call allocations are the escaped message and the
+        timestamp digits.
+        
+        Args:
+            event (str): Event name (a constant identifier, not escaped)
+            message (str): Human-readable message
+            extra (str): Pre-serialized fields inserted after "timestamp"
+        
+        Returns:
+            memoryview: UTF-8 JSON payload, valid until the next call
+            (bytes if it does not fit in _BUF)
+        """
+        parts = (b'{"event": "', event.encode(), b'", "message": ',
+                 json.dumps(message).encode(), b', "timestamp": ',
+                 str(int(time.time())).encode(), extra.encode(), self._device_tail)
+        n = 0
+        for part in parts:
+            n += len(part)
+        if n > len(_BUF):
+            return b"".join(parts)
+        n = 0
+        for part in parts:
+            end = n + len(part)
+            _MV[n:end] = part
+            n = end
+        return _MV[:n]
+    
     def _send_notification(self, category, data):
         """
         Send notification via MQTT.
         
+        While disconnected, or if the publish fails, the payload is queued
+        in the outbox and delivered on the next successful connect().
+        
         Args:
             category (str): Notification category (window_change, error, system, config)
-            data (dict): Notification data
+            data (dict, str or bytes-like): Notification data, or an already
+                serialized payload
         """
-        if not self.client or not self.connected:
+        if not self.notifications_enabled:
             return
         
+        topic = None
+        message = None
         try:
-            # Create topic with category
-            topic = f"{self.topic}/{category}"
+            # Precomputed topic for known categories
+            topic = self._topics.get(category) or (self.topic + "/" + category).encode()
+            
+            # Convert data to JSON unless it is already serialized, and hand
+            # umqtt bytes: it sizes the packet with len(), which for a str
+            # counts characters rather than UTF-8 bytes
+            if isinstance(data, dict):
+                data = json.dumps(data)
+            message = data.encode() if isinstance(data, str) else data
             
-            # Convert data to JSON
-            message = json.dumps(data)
+            if not self.client or not self.connected:
+                self._queue(topic, message)
+                return
             
-            # Publish message
+            # Publish message. umqtt writes the header, topic and payload
+            # separately, so a failure may leave a partial packet on the wire:
+            # never republish on this socket; the handler below queues the
+            # payload and it is resent after a clean reconnect
             self.client.publish(topic, message)
-            log.debug(f"[MQTT] Published notification to {topic}")
+            self._last_io = time.ticks_ms()
+            if log.debug_enabled:
+                log.debug(f"[MQTT] Published notification to {topic}")
             
         except Exception as e:
             log.error(f"[MQTT] Failed to send notification: {e}")
-            # Try to reconnect on next notification
-            self.connected = False
+            # The stream may hold a partial packet: drop the socket and
+            # reconnect on next notification
+            self._drop_connection()
+            if message is not None:
+                self._queue(topic, message)
+    
+    def _drop_connection(self):
+        """Mark the link down and close its socket; connect() starts afresh."""
+        self.connected = False
+        try:
+            self.client.sock.close()
+        except Exception:
+            pass
+    
+    def _queue(self, topic, message):
+        """Hold a payload for the next connect, dropping the oldest when full."""
+        if len(self._outbox) >= _OUTBOX_MAX:
+            self._outbox.pop(0)
+        # A memoryview points into the shared _BUF; keep a copy
+        if isinstance(message, memoryview):
+            message = bytes(message)
+        self._outbox.append((topic, message))
+    
+    def _flush_outbox(self):
+        """
+        Publish queued payloads oldest first.
+        
+        A failure drops the connection like a failed publish does; the
+        entry that failed and everything behind it stay queued.
+        """
+        outbox = self._outbox
+        while outbox:
+            topic, message = outbox[0]
+            try:
+                self.client.publish(topic, message)
+            except Exception as e:
+                log.error(f"[MQTT] Failed to deliver queued notification: {e}")
+                self._drop_connection()
+                return
+            outbox.pop(0)
+            self._last_io = time.ticks_ms()
+    
+    def keepalive(self):
+        """
+        Ping the broker when the connection has been idle for _PING_INTERVAL.
+        
+        Call regularly (every few seconds) while connected; the broker drops
+        clients that send nothing for 1.5x the negotiated keepalive.
+        """
+        if not self.connected or not self.client:
+            return
+        # ticks, not time.time(): an NTP clock step must not skew the idle timer
+        now = time.ticks_ms()
+        if time.ticks_diff(now, self._last_io) < _PING_INTERVAL * 1000:
+            return
+        try:
+            # Consume the previous PINGRESP, if any, before the next ping
+            self.client.check_msg()
+            self.client.ping()
+            self._last_io = now
+        except Exception as e:
+            log.warn(f"[MQTT] Keepalive ping failed: {e}")
+            self._drop_connection()
     
     def reload_config(self):
         """Reload configuration and reconnect if needed."""
+        if config_manager.config_rev == self._config_rev:
+            return  # config unchanged since the last load
+        
         old_enabled = self.notifications_enabled
         old_broker = self.broker
         old_port = self.port
@@ -268,7 +446,7 @@ class MQTTNotifier:
     def get_status(self):
         """Get current MQTT connection status."""
         return {
-            "mqtt_available": MQTT_AVAILABLE,
+            "mqtt_available": MQTTClient is not None,
             "notifications_enabled": self.notifications_enabled,
             "connected": self.connected,
             "broker": self.broker if self.notifications_enabled else None,
@@ -276,5 +454,63 @@ class MQTTNotifier:
         }
 
 
-# Global MQTT notifier instance
-mqtt_notifier = MQTTNotifier()
+class _NullNotifier:
+    """
+    Stand-in used while notifications are disabled in the configuration.
+    
+    Exposes the attributes and methods callers use on MQTTNotifier as
+    no-ops, so a disabled deployment never allocates a client, topics or
+    payload state.
+    """
+    
+    connected = False
+    notifications_enabled = False
+    
+    def __init__(self):
+        # Revision of the config that had notifications disabled
+        self._config_rev = config_manager.config_rev
+    
+    def connect(self):
+        return False
+    
+    def _noop(self, *args):
+        pass
+    
+    disconnect = keepalive = reload_config = _noop
+    notify_error = notify_multi_pin_changes = notify_config_change = _noop
+    
+    def get_status(self):
+        return {
+            "mqtt_available": MQTTClient is not None,
+            "notifications_enabled": False,
+            "connected": False,
+            "broker": None,
+            "topic": None
+        }
+
+
+_instance = None
+
+
+def get_notifier():
+    """
+    Get the global notifier, creating it on first use.
+    
+    Returns a _NullNotifier while notifications are disabled; once a config
+    update enables them, the next call replaces it with a real MQTTNotifier.
+    """
+    global _instance
+    if _instance is None or (isinstance(_instance, _NullNotifier) and
+                             _instance._config_rev != config_manager.config_rev):
+        if config_manager.NOTIFICATIONS_ENABLED:
+            _instance = MQTTNotifier()
+        else:
+            _instance = _NullNotifier()
+    return _instance
+
+
+def __getattr__(name):
+    """Keep `from lib.mqtt_notifier import mqtt_notifier` working."""
+    if name == "mqtt_notifier":
+        return get_notifier()
+    raise AttributeError(name)
@@ -4,13 +4,31 @@ PWM controller for LED intensity or other output on specified GPIO pins.
 Controls PWM frequency and duty cycle with debug logging for multiple pins.
 """
 
+import array
 from machine import Pin, PWM
+from micropython import const
 from lib.config_manager import PWM_FREQUENCY, config_manager
 from simple_logger import Logger
 
 
 log = Logger()
 
+_DUTY_MAX = const(65535)  # full scale for PWM.duty_u16()
+
+# duty_u16 value for each whole percent 0..100, rounded; built once so the
+# common integer case is a single index with no (soft-)float math
+_DUTY_LUT = array.array('H', [(i * _DUTY_MAX + 50) // 100 for i in range(101)])
+
+
+def _duty_u16(percent):
+    """Convert a duty cycle percentage to a duty_u16() value."""
+    if isinstance(percent, int) and 0 <= percent <= 100:
+        return _DUTY_LUT[percent]
+    # Fractional or out-of-range percent: integer math on hundredths,
+    # clamped to what duty_u16() accepts
+    duty_value = (int(percent * 100) * _DUTY_MAX + 5000) // 10000
+    return max(0, min(_DUTY_MAX, duty_value))
+
 
 class PWMController:
     """
@@ -25,14 +43,18 @@ class PWMController:
         set_duty_percent(percent) - Set PWM duty cycle in %.
         deinit() - Deinitialize PWM.
     """
+    # Shared default; an instance only stores its own freq when it differs
+    freq = PWM_FREQUENCY
+
     def __init__(self, freq=PWM_FREQUENCY, pin=16, name="PWM"):
         self.pin = pin
         self.name = name
         self.pwm = PWM(Pin(pin))
-        self.freq = freq
-        self.pwm.freq(self.freq)
-        self.current_duty = 0
-        self.set_duty_percent(0)
+        if freq != self.freq:
+            self.freq = freq
+        self.pwm.freq(freq)
+        # Written unconditionally: set_duty_percent() skips unchanged values
+        self._apply_duty_u16(0, 0)
         log.info(f"[PWM] {self.name} controller initialized at {self.freq} Hz on GPIO{pin}")
 
     def set_freq(self, freq):
@@ -41,11 +63,21 @@ class PWMController:
         log.info(f"[PWM] {self.name} frequency set to {freq} Hz")
 
     def set_duty_percent(self, percent):
-        duty_value = int(percent * 65535 / 100)
+        # Store what the pin actually runs at, so status reports match it
+        percent = max(0, min(100, percent))
+        # Re-writing the same duty is a no-op at best and a glitch at worst
+        if percent == self.current_duty:
+            return
+        duty_value = _duty_u16(percent)
+        self._apply_duty_u16(duty_value, percent)
+        # Only formatted when DEBUG is on, so it costs one flag check otherwise
+        if log.debug_enabled:
+            log.debug("[PWM] %s duty cycle set to %s%% (duty_u16=%d)" % (self.name, percent, duty_value))
+
+    def _apply_duty_u16(self, duty_value, percent):
+        """Write an already converted duty value; percent is what it represents."""
         self.pwm.duty_u16(duty_value)
         self.current_duty = percent
-        # Reduce logging to save memory
-        # log.debug(f"[PWM] {self.name} duty cycle set to {percent}% (duty_u16={duty_value})")
 
     def get_duty_percent(self):
         return self.current_duty
@@ -75,26 +107,30 @@ class MultiPWMManager:
         # Clean up existing controllers
         self.deinit_all()
         
-        config = config_manager.get_config_dict()
-        self.pwm_frequency = config.get('hardware', {}).get('pwm_frequency', 1000)
-        pwm_pins = config.get('pwm_pins', {})
+        config = config_manager.get_config_view()
+        hardware = config.get('hardware') or {}
+        self.pwm_frequency = hardware.get('pwm_frequency', 1000)
+        pwm_pins = config.get('pwm_pins') or {}
         
         enabled_count = 0
         for pin_key, pin_config in pwm_pins.items():
             # Skip comment fields
-            if pin_key.startswith('_'):
+            if pin_key[:1] == '_':
                 continue
                 
             if not pin_config.get('enabled', False):
                 continue
                 
             gpio_pin = pin_config.get('gpio_pin')
-            pin_name = pin_config.get('name', f'Pin {gpio_pin}')
             
             # Validate gpio_pin
             if gpio_pin is None:
                 log.error(f"[PWM_MGR] No gpio_pin specified for {pin_key}")
                 continue
+            
+            pin_name = pin_config.get('name')
+            if pin_name is None:
+                pin_name = f'Pin {gpio_pin}'
                 
             try:
                 controller = PWMController(
@@ -145,9 +181,16 @@ class MultiPWMManager:
         Args:
             percent (int): Duty cycle percentage (0-100)
         """
-        for pin_key, controller in self.controllers.items():
-            controller.set_duty_percent(percent)
-        log.debug(f"[PWM_MGR] Set all pins to {percent}%")
+        # Convert once, then write the same value to every channel back to back
+        # (inlined _apply_duty_u16 to keep the loop free of method calls)
+        percent = max(0, min(100, percent))
+        duty_value = _duty_u16(percent)
+        for controller in self.controllers.values():
+            if controller.current_duty != percent:
+                controller.pwm.duty_u16(duty_value)
+                controller.current_duty = percent
+        if log.debug_enabled:
+            log.debug(f"[PWM_MGR] Set all pins to {percent}%")
     
     def get_enabled_pins(self):
         """
@@ -166,15 +209,13 @@ class MultiPWMManager:
             dict: {pin_key: {'name': str, 'gpio_pin': int, 'duty_percent': int}}
         """
         status = {}
-        config = config_manager.get_config_dict()
-        pwm_pins = config.get('pwm_pins', {})
-        
+        # Name and GPIO are fixed when a controller is built from config, so
+        # read them from the controller instead of looking up config per call
         for pin_key, controller in self.controllers.items():
-            pin_config = pwm_pins.get(pin_key, {})
             status[pin_key] = {
-                'name': pin_config.get('name', 'Unknown'),
-                'gpio_pin': pin_config.get('gpio_pin', 0),
-                'duty_percent': controller.get_duty_percent()
+                'name': controller.name,
+                'gpio_pin': controller.pin,
+                'duty_percent': controller.current_duty
             }
         
         return status
@@ -15,7 +15,7 @@ Requires: micropython-urtc library with DS3231 support.
 """
 
 from simple_logger import Logger
-from lib.rtc_shared import rtc
+from lib.rtc_shared import get_rtc
 
 log = Logger()
 
@@ -30,7 +30,7 @@ def get_current_time():
     """
     # DateTimeTuple(year, month, day, weekday, hour, minute, second,
     #               millisecond)
-    dt = rtc.datetime()
+    dt = get_rtc().datetime()
 
     year = dt.year
     month = dt.month
@@ -40,8 +40,9 @@ def get_current_time():
     second = dt.second
     weekday = dt.weekday
 
-    log.debug("[RTC] Current time read (no offset): "
-              "{:04d}-{:02d}-{:02d} {:02d}:{:02d}:{:02d} Weekday: {}"
-              .format(year, month, day, hour, minute, second, weekday))
+    if log.debug_enabled:
+        log.debug("[RTC] Current time read (no offset): "
+                  "{:04d}-{:02d}-{:02d} {:02d}:{:02d}:{:02d} Weekday: {}"
+                  .format(year, month, day, hour, minute, second, weekday))
 
     return (year, month, day, hour, minute, second, weekday)
@@ -3,14 +3,60 @@ Shared RTC and I2C instances for use across modules.
 
 This module provides shared instances of I2C bus and DS3231 RTC to avoid
 creating multiple instances which could cause conflicts.
+
+Both are created lazily on the first get_rtc() call, so importing this
+module touches no hardware and the pins are read from the configuration
+as it stands at that point. Call reset_rtc() after the RTC pins change
+to rebind the bus on the next get_rtc().
 """
 
 from machine import I2C, Pin
 import urtc
-from lib.config_manager import RTC_I2C_SDA_PIN, RTC_I2C_SCL_PIN
 
-# Initialize shared I2C bus for RTC
-i2c = I2C(0, scl=Pin(RTC_I2C_SCL_PIN), sda=Pin(RTC_I2C_SDA_PIN))
+_i2c = None
+_rtc = None
+
+
+def get_rtc():
+    """
+    Return the shared DS3231 instance, creating the I2C bus on first use.
+
+    Returns:
+        urtc.DS3231: Shared RTC driver instance
+    """
+    global _i2c, _rtc
+    if _rtc is None:
+        from lib.config_manager import RTC_I2C_SDA_PIN, RTC_I2C_SCL_PIN
+        _i2c = I2C(0, scl=Pin(RTC_I2C_SCL_PIN), sda=Pin(RTC_I2C_SDA_PIN))
+        _rtc = urtc.DS3231(_i2c)
+    return _rtc
+
+
+def get_i2c():
+    """
+    Return the shared I2C bus used by the RTC, creating it on first use.
+
+    Returns:
+        machine.I2C: Shared I2C bus instance
+    """
+    get_rtc()
+    return _i2c
+
+
+def reset_rtc():
+    """
+    Drop the shared I2C and RTC instances so the next get_rtc() rebuilds
+    them with the current pin configuration.
+    """
+    global _i2c, _rtc
+    _i2c = None
+    _rtc = None
+
 
-# Create shared DS3231 instance from urtc library
-rtc = urtc.DS3231(i2c)
\ No newline at end of file
+def __getattr__(name):
+    # Backward compatibility for `from lib.rtc_shared import rtc, i2c`
+    if name == "rtc":
+        return get_rtc()
+    if name == "i2c":
+        return get_i2c()
+    raise AttributeError(name)
@@ -10,8 +10,41 @@ Timestamps are formatted as:
 e.g. <Mon 18 Aug 2025 - 15:55:10 IST(UTC+5:30)>
 """
 
+import time
+from micropython import const
 from lib.config_manager import LOG_LEVEL, TIMEZONE_NAME, TIMEZONE_OFFSET
-from lib.rtc_shared import rtc
+from lib.rtc_shared import get_rtc
+
+# Level thresholds, folded into the level methods at compile time
+_FATAL = const(0)
+_ERROR = const(1)
+_WARN = const(2)
+_INFO = const(3)
+_DEBUG = const(4)
+
+# Last formatted timestamp and the ticks_ms() it was read at, shared by all
+# Logger instances so a burst of log lines costs one DS3231 read
+_TS_MAX_AGE_MS = const(500)
+_ts_text = None
+_ts_ms = 0
+
+_WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun",
+           "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def _format_tz_suffix():
+    """
+    Format the constant end of every timestamp, e.g. 'IST(UTC+5:30)'.
+
+    The timezone values are bound at import, so this is computed once.
+    """
+    total_minutes = int(abs(TIMEZONE_OFFSET) * 60)
+    sign = '+' if TIMEZONE_OFFSET >= 0 else '-'
+    return f"{TIMEZONE_NAME}(UTC{sign}{total_minutes // 60}:{total_minutes % 60:02d})"
+
+
+_TZ_SUFFIX = _format_tz_suffix()
 
 class Logger:
     """
@@ -27,42 +60,39 @@ class Logger:
     Args:
         level (str): Minimum logging level to output. Default is from config.
 
+    Attributes:
+        debug_enabled (bool): True if DEBUG messages are output; check it
+            before formatting an expensive debug message.
+
     Methods:
         fatal(msg), error(msg), warn(msg), info(msg), debug(msg): Log messages
         at corresponding levels.
     """
 
-    LEVELS = {'FATAL': 0, 'ERROR': 1, 'WARN': 2, 'INFO': 3, 'DEBUG': 4}
-
-    WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-    MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
-              "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+    LEVELS = {'FATAL': _FATAL, 'ERROR': _ERROR, 'WARN': _WARN, 'INFO': _INFO, 'DEBUG': _DEBUG}
 
     def __init__(self, level=None):
-        self.level = self.LEVELS.get(level or LOG_LEVEL, 3)
-        self.rtc = rtc
-
-    def _format_offset(self):
-        """
-        Format the timezone offset (float hours) to a string like '+5:30' or
-        '-4:00'.
-        """
-        total_minutes = int(abs(TIMEZONE_OFFSET) * 60)
-        sign = '+' if TIMEZONE_OFFSET >= 0 else '-'
-        hours = total_minutes // 60
-        minutes = total_minutes % 60
-        return f"{sign}{hours}:{minutes:02d}"
+        self.level = self.LEVELS.get(level or LOG_LEVEL, _INFO)
+        # Lets hot paths skip building debug messages that would be dropped
+        self.debug_enabled = self.level >= _DEBUG
 
     def _timestamp(self):
         """
         Return current timestamp string formatted as:
         <Weekday> <DD> <Mon> <YYYY> - hh:mm:ss <TIMEZONE_NAME>(UTC±offset)
 
-        Obtains time from DS3231 RTC to ensure local time with offset.
+        Obtains time from DS3231 RTC to ensure local time with offset. A
+        reading less than _TS_MAX_AGE_MS old is reused instead of going back
+        to the I2C bus.
 
         e.g. <Mon 18 Aug 2025 - 15:55:10 IST(UTC+5:30)>
         """
-        dt = self.rtc.datetime()
+        global _ts_text, _ts_ms
+        now_ms = time.ticks_ms()
+        if _ts_text is not None and time.ticks_diff(now_ms, _ts_ms) < _TS_MAX_AGE_MS:
+            return _ts_text
+
+        dt = get_rtc().datetime()
         year = dt.year
         month = dt.month
         day = dt.day
@@ -72,14 +102,13 @@ class Logger:
         # urtc weekday: Monday=1,...Sunday=7; map to 0-based
         weekday_idx = dt.weekday - 1
 
-        weekday_str = self.WEEKDAYS[weekday_idx if 0 <= weekday_idx < 7 else 0]
-        month_str = self.MONTHS[month-1] if 1 <= month <= 12 else "Jan"
-
-        offset_str = self._format_offset()
+        weekday_str = _WEEKDAYS[weekday_idx if 0 <= weekday_idx < 7 else 0]
+        month_str = _MONTHS[month-1] if 1 <= month <= 12 else "Jan"
 
-        return "<{} {:02d} {} {:04d} - {:02d}:{:02d}:{:02d} {}(UTC{})>".format(
-            weekday_str, day, month_str, year, hour, minute, second,
-            TIMEZONE_NAME, offset_str)
+        _ts_text = "<{} {:02d} {} {:04d} - {:02d}:{:02d}:{:02d} {}>".format(
+            weekday_str, day, month_str, year, hour, minute, second, _TZ_SUFFIX)
+        _ts_ms = now_ms
+        return _ts_text
 
     def log(self, level, msg):
         """
@@ -89,26 +118,36 @@ class Logger:
             level (str): Logging level of the message.
             msg (str): The message to log.
         """
-        lvl_value = self.LEVELS.get(level, 3)
-        if lvl_value <= self.level:
-            print("{} {}: {}".format(self._timestamp(), level, msg))
+        if self.LEVELS.get(level, _INFO) <= self.level:
+            self._emit(level, msg)
+
+    def _emit(self, level, msg):
+        """Print an already level-checked message with its timestamp."""
+        print("{} {}: {}".format(self._timestamp(), level, msg))
+
+    # The level methods compare against their fixed level directly, so a
+    # filtered message costs one integer compare and no dict lookup
 
     def fatal(self, msg):
         """Log message with FATAL level."""
-        self.log('FATAL', msg)
+        self._emit('FATAL', msg)
 
     def error(self, msg):
         """Log message with ERROR level."""
-        self.log('ERROR', msg)
+        if self.level >= _ERROR:
+            self._emit('ERROR', msg)
 
     def warn(self, msg):
         """Log message with WARN level."""
-        self.log('WARN', msg)
+        if self.level >= _WARN:
+            self._emit('WARN', msg)
 
     def info(self, msg):
         """Log message with INFO level."""
-        self.log('INFO', msg)
+        if self.level >= _INFO:
+            self._emit('INFO', msg)
 
     def debug(self, msg):
         """Log message with DEBUG level."""
-        self.log('DEBUG', msg)
+        if self.debug_enabled:
+            self._emit('DEBUG', msg)
@@ -1,7 +1,8 @@
 """
 Sunrise/Sunset provider with JSON-backed data and weekly fallback.
 
-- Reads sun_times.json if available. Expected flexible formats:
+- Reads sun_times.json if available, streaming it in small chunks so large
+  tables never have to fit in RAM as a parsed JSON tree. Expected flexible formats:
   1) Flat keys: "dd,mm->rise": "HH:MM", "dd,mm->set": "HH:MM"
   2) days map: { "days": { "dd-mm": {"rise": "HH:MM", "set": "HH:MM"}, ... } }
   3) List of entries: [ {"dd": 1, "mm": 1, "rise": "07:12", "set": "17:42"}, ... ]
@@ -9,9 +10,11 @@ Sunrise/Sunset provider with JSON-backed data and weekly fallback.
 - get_sunrise_sunset(mm, dd) returns (rise_h, rise_m, set_h, set_m)
 - If an exact day is missing, falls back to the last prior date available (weekly buckets supported).
 - If JSON is missing or invalid, returns default fallback times.
+- The JSON is loaded lazily on first use, not at import, to keep it off the boot-time heap peak.
 """
 
-import json
+import array
+import gc
 
 # Default fallback times (6:30 AM sunrise, 6:30 PM sunset)
 DEFAULT_SUNRISE = (6, 30)
@@ -20,112 +23,368 @@ DEFAULT_SUNSET = (18, 30)
 _location = None
 _lat = None
 _lon = None
-_entries = []  # list of tuples: (mm, dd, rise_h, rise_m, set_h, set_m)
-_sorted_keys = []  # list of (mm, dd) sorted
+# Struct-of-arrays table, one byte per field per day, sorted chronologically
+_key = array.array('H')  # packed (mm << 5) | dd, ascending
+_dd = bytearray()
+_mm = bytearray()
+_rh = bytearray()
+_rm = bytearray()
+_sh = bytearray()
+_sm = bytearray()
+
+# One-slot memo of the last lookup; the answer only changes at midnight
+_cache_key = -1  # packed (mm << 5) | dd of the cached date
+_cache_val = None  # (rise_h, rise_m, set_h, set_m)
+
+_CHUNK_SIZE = 256  # bytes read from flash per readinto()
+
+# JSON punctuation as byte values
+_LBRACE = 0x7B
+_RBRACE = 0x7D
+_LBRACKET = 0x5B
+_RBRACKET = 0x5D
+_QUOTE = 0x22
+_COLON = 0x3A
+_COMMA = 0x2C
+_BACKSLASH = 0x5C
+_ESCAPES = {0x6E: 0x0A, 0x74: 0x09, 0x72: 0x0D, 0x62: 0x08, 0x66: 0x0C}
 
 
 def _parse_time_str(s):
-    try:
-        parts = s.strip().split(':')
-        return int(parts[0]), int(parts[1])
-    except Exception:
+    """Parse "HH:MM" (or "HH:MM:SS") into (h, m); anything malformed gives (0, 0)."""
+    # Checked up front instead of catching int() errors: runs twice per day
+    # while loading, and the values are almost always well formed
+    if not isinstance(s, str):
+        return 0, 0
+    s = s.strip()
+    i = s.find(':')
+    j = s.find(':', i + 1)
+    h = s[:i]
+    m = s[i + 1:j] if j > 0 else s[i + 1:]
+    if i < 1 or not (h.isdigit() and m.isdigit()):
         return 0, 0
+    return int(h), int(m)
+
+
+class _JsonStream:
+    """
+    Minimal pull parser over a binary file.
+
+    Reads the file in small chunks so only the value currently being parsed
+    is held in RAM, never the whole document.
+    """
+
+    def __init__(self, f):
+        self._f = f
+        self._buf = bytearray(_CHUNK_SIZE)
+        self._n = 0
+        self._i = 0
+
+    def _next_byte(self):
+        if self._i >= self._n:
+            self._n = self._f.readinto(self._buf) or 0
+            self._i = 0
+            if not self._n:
+                raise ValueError("Unexpected end of JSON")
+        c = self._buf[self._i]
+        self._i += 1
+        return c
+
+    def peek(self):
+        """Return the next non-whitespace byte without consuming it (-1 at EOF)."""
+        while True:
+            if self._i >= self._n:
+                self._n = self._f.readinto(self._buf) or 0
+                self._i = 0
+                if not self._n:
+                    return -1
+            c = self._buf[self._i]
+            if c > 0x20:
+                return c
+            self._i += 1
+
+    def take(self):
+        """Consume and return the next non-whitespace byte."""
+        c = self.peek()
+        if c < 0:
+            raise ValueError("Unexpected end of JSON")
+        self._i += 1
+        return c
+
+    def expect(self, expected):
+        if self.take() != expected:
+            raise ValueError("Malformed JSON")
+
+    def more(self, close):
+        """Consume a separator; return False once the container `close` ends."""
+        c = self.take()
+        if c == _COMMA:
+            return True
+        if c == close:
+            return False
+        raise ValueError("Malformed JSON")
+
+    def string(self):
+        """Read a string whose opening quote has already been consumed."""
+        out = bytearray()
+        while True:
+            c = self._next_byte()
+            if c == _QUOTE:
+                return str(out, 'utf-8')
+            if c == _BACKSLASH:
+                c = self._next_byte()
+                if c == 0x75:  # \uXXXX
+                    code = 0
+                    for _ in range(4):
+                        code = code * 16 + int(chr(self._next_byte()), 16)
+                    out.extend(chr(code).encode('utf-8'))
+                    continue
+                c = _ESCAPES.get(c, c)
+            out.append(c)
+
+    def scalar(self):
+        """Read a number or true/false/null literal."""
+        out = bytearray()
+        while True:
+            c = self.peek()
+            if c < 0 or c == _COMMA or c == _RBRACE or c == _RBRACKET:
+                break
+            out.append(c)
+            self._i += 1
+        s = str(out, 'utf-8')
+        if s == 'true':
+            return True
+        if s == 'false':
+            return False
+        if s == 'null':
+            return None
+        try:
+            return int(s)
+        except ValueError:
+            return float(s)
+
+    def value(self):
+        """Materialize the next value. Only used for small values (one entry)."""
+        c = self.take()
+        if c == _QUOTE:
+            return self.string()
+        if c == _LBRACE:
+            obj = {}
+            if self.peek() == _RBRACE:
+                self._i += 1
+                return obj
+            while True:
+                self.expect(_QUOTE)
+                key = self.string()
+                self.expect(_COLON)
+                obj[key] = self.value()
+                if not self.more(_RBRACE):
+                    return obj
+        if c == _LBRACKET:
+            arr = []
+            if self.peek() == _RBRACKET:
+                self._i += 1
+                return arr
+            while True:
+                arr.append(self.value())
+                if not self.more(_RBRACKET):
+                    return arr
+        self._i -= 1
+        return self.scalar()
+
+    def items(self):
+        """Iterate (key, stream) over an object; caller must consume each value."""
+        self.expect(_LBRACE)
+        if self.peek() == _RBRACE:
+            self._i += 1
+            return
+        while True:
+            self.expect(_QUOTE)
+            key = self.string()
+            self.expect(_COLON)
+            yield key
+            if not self.more(_RBRACE):
+                return
+
+    def elements(self):
+        """Iterate over an array; caller must consume each element."""
+        self.expect(_LBRACKET)
+        if self.peek() == _RBRACKET:
+            self._i += 1
+            return
+        while True:
+            yield
+            if not self.more(_RBRACKET):
+                return
+
+
+def _append(dd, mm, rh, rm, sh, sm):
+    _key.append(mm << 5 | dd)
+    _dd.append(dd)
+    _mm.append(mm)
+    _rh.append(rh)
+    _rm.append(rm)
+    _sh.append(sh)
+    _sm.append(sm)
+
+
+def _add_entry(dd, mm, rise, sset):
+    rh, rm = _parse_time_str(rise)
+    sh, sm = _parse_time_str(sset)
+    _append(dd, mm, rh, rm, sh, sm)
+
+
+def _add_flat(dd, mm, is_rise, v):
+    """Accumulate one half of a flat-key pair into its (dd, mm) entry."""
+    k = mm << 5 | dd
+    n = len(_key)
+    # "->rise"/"->set" keys for the same day are normally adjacent
+    i = n - 1
+    if not n or _key[i] != k:
+        i = 0
+        while i < n and _key[i] != k:
+            i += 1
+        if i == n:
+            _append(dd, mm, 0, 0, 0, 0)
+    h, m = _parse_time_str(v)
+    if is_rise:
+        _rh[i] = h
+        _rm[i] = m
+    else:
+        _sh[i] = h
+        _sm[i] = m
+
+
+def _permute(col, order):
+    out = bytearray(len(order))
+    for j, i in enumerate(order):
+        out[j] = col[i]
+    return out
+
+
+def _sort_columns():
+    """Sort all columns chronologically by _key (no-op if already sorted)."""
+    global _key, _dd, _mm, _rh, _rm, _sh, _sm
+    n = len(_key)
+    i = 1
+    while i < n and _key[i - 1] <= _key[i]:
+        i += 1
+    if i >= n:
+        return
+    keys = _key
+    order = sorted(range(n), key=lambda j: keys[j])
+    _key = array.array('H', [keys[j] for j in order])
+    _dd = _permute(_dd, order)
+    _mm = _permute(_mm, order)
+    _rh = _permute(_rh, order)
+    _rm = _permute(_rm, order)
+    _sh = _permute(_sh, order)
+    _sm = _permute(_sm, order)
+
+
+def _read_entry_list(js):
+    # entries format: [ {"dd": 1, "mm": 1, "rise": "07:12", "set": "17:42"}, ... ]
+    for _ in js.elements():
+        e = js.value()
+        _add_entry(int(e.get('dd')), int(e.get('mm')), e.get('rise', '0:0'), e.get('set', '0:0'))
+
+
+def _read_days_map(js):
+    # days map format: { "dd-mm": {"rise": "HH:MM", "set": "HH:MM"} }
+    for key in js.items():
+        val = js.value()
+        if not isinstance(val, dict):
+            continue
+        parts = key.replace('/', '-').replace(',', '-').strip().split('-')
+        if len(parts) != 2:
+            continue
+        _add_entry(int(parts[0]), int(parts[1]), val.get('rise', '0:0'), val.get('set', '0:0'))
 
 
 def _load_json():
-    global _location, _lat, _lon, _entries, _sorted_keys
+    global _location, _lat, _lon, _key, _dd, _mm, _rh, _rm, _sh, _sm, _cache_key
+    _cache_key = -1
     _location = None
     _lat = None
     _lon = None
-    _entries = []
-    _sorted_keys = []
+    _key = array.array('H')
+    _dd = bytearray()
+    _mm = bytearray()
+    _rh = bytearray()
+    _rm = bytearray()
+    _sh = bytearray()
+    _sm = bytearray()
 
     filename = 'sun_times.json'  # relative; compatible with device root
     try:
-        with open(filename, 'r') as f:
-            data = json.load(f)
+        f = open(filename, 'rb')
     except Exception:
         return False
 
-    # Capture meta if present
-    if isinstance(data, dict):
-        _location = data.get('location')
-        _lat = data.get('lat')
-        _lon = data.get('lon')
-
-    # Detect format and normalize to entries
+    # Stream the document and normalize every supported format to entries
     try:
-        if isinstance(data, dict) and 'days' in data and isinstance(data['days'], dict):
-            # days map format: { "dd-mm": {"rise": "HH:MM", "set": "HH:MM"} }
-            for key, val in data['days'].items():
-                if not isinstance(val, dict):
-                    continue
-                ddmm = key.replace('/', '-').replace(',', '-').strip()
-                parts = ddmm.split('-')
-                if len(parts) != 2:
-                    continue
-                dd = int(parts[0])
-                mm = int(parts[1])
-                rh, rm = _parse_time_str(val.get('rise', '0:0'))
-                sh, sm = _parse_time_str(val.get('set', '0:0'))
-                _entries.append((dd, mm, rh, rm, sh, sm))
-
-        elif isinstance(data, dict) and any('->rise' in k for k in data.keys() if isinstance(k, str)):
-            # flat key format
-            # Build intermediate map
-            tmp = {}
-            for k, v in data.items():
-                if not isinstance(k, str):
-                    continue
-                if '->rise' in k or '->set' in k:
-                    date_part = k.split('->')[0].strip()
-                    parts = date_part.replace('/', ',').split(',')
-                    if len(parts) != 2:
-                        continue
-                    dd = int(parts[0])
-                    mm = int(parts[1])
-                    entry = tmp.setdefault((dd, mm), {})
-                    if 'rise' in k:
-                        entry['rise'] = v
+        with f:
+            js = _JsonStream(f)
+            c = js.peek()
+            if c == _LBRACKET:
+                _read_entry_list(js)
+            elif c == _LBRACE:
+                for key in js.items():
+                    nxt = js.peek()
+                    if key == 'days' and nxt == _LBRACE:
+                        _read_days_map(js)
+                    elif key == 'entries' and nxt == _LBRACKET:
+                        _read_entry_list(js)
+                    elif '->rise' in key or '->set' in key:
+                        # flat key format: "dd,mm->rise": "HH:MM"
+                        v = js.value()
+                        parts = key.split('->')[0].strip().replace('/', ',').split(',')
+                        if len(parts) != 2:
+                            continue
+                        _add_flat(int(parts[0]), int(parts[1]), 'rise' in key, v)
+                    elif key == 'location':
+                        _location = js.value()
+                    elif key == 'lat':
+                        _lat = js.value()
+                    elif key == 'lon':
+                        _lon = js.value()
                     else:
-                        entry['set'] = v
-            for (dd, mm), val in tmp.items():
-                rh, rm = _parse_time_str(val.get('rise', '0:0'))
-                sh, sm = _parse_time_str(val.get('set', '0:0'))
-                _entries.append((dd, mm, rh, rm, sh, sm))
-
-        elif isinstance(data, dict) and 'entries' in data and isinstance(data['entries'], list):
-            for e in data['entries']:
-                dd = int(e.get('dd'))
-                mm = int(e.get('mm'))
-                rh, rm = _parse_time_str(e.get('rise', '0:0'))
-                sh, sm = _parse_time_str(e.get('set', '0:0'))
-                _entries.append((dd, mm, rh, rm, sh, sm))
-        elif isinstance(data, list):
-            for e in data:
-                dd = int(e.get('dd'))
-                mm = int(e.get('mm'))
-                rh, rm = _parse_time_str(e.get('rise', '0:0'))
-                sh, sm = _parse_time_str(e.get('set', '0:0'))
-                _entries.append((dd, mm, rh, rm, sh, sm))
-        else:
-            # Unknown format
-            return False
+                        js.value()
+            else:
+                # Unknown format
+                return False
 
-        # Sort keys by month first, then day (for chronological order)
-        _entries.sort(key=lambda t: (t[1], t[0]))  # Sort by (mm, dd)
-        _sorted_keys = [(dd, mm) for (dd, mm, _, _, _, _) in _entries]
-        return len(_entries) > 0
+        # Sort by month first, then day (for chronological order)
+        _sort_columns()
+        return len(_key) > 0
     except Exception:
         return False
 
 
-# Attempt to load data at import
-_loaded = _load_json()
+# Load state: None = not attempted yet, True/False = result of _load_json()
+_loaded = None
+
+
+def _ensure_loaded():
+    """Load the JSON on first use and reclaim the parser's transient garbage."""
+    global _loaded
+    if _loaded is None:
+        _loaded = _load_json()
+        gc.collect()
+    return _loaded
+
+
+def reload():
+    """Forget the loaded table so the next lookup re-reads sun_times.json."""
+    global _loaded, _cache_key
+    _loaded = None
+    _cache_key = -1
 
 
 def get_location_info():
     """Return (location, lat, lon) if available, else (None, None, None)."""
+    if _loaded is None:
+        _ensure_loaded()
     return _location, _lat, _lon
 
 
@@ -136,23 +395,29 @@ def get_sunrise_sunset(month, day):
     If JSON not loaded, returns default fallback times.
     Returns tuple: (rise_h, rise_m, set_h, set_m)
     """
+    global _cache_key, _cache_val
+    if _loaded is None:
+        _ensure_loaded()
     try:
-        if _loaded and _entries:
-            target = (int(day), int(month))  # Convert to (dd, mm) format
-            # Binary-like search over sorted keys to find last <= target
-            last_idx = -1
-            for i, key in enumerate(_sorted_keys):
-                # Compare by month first, then day for chronological order
-                target_mm, target_dd = target[1], target[0]
-                key_mm, key_dd = key[1], key[0]
-                if key_mm < target_mm or (key_mm == target_mm and key_dd <= target_dd):
-                    last_idx = i
+        if _loaded and _key:
+            target = int(month) << 5 | int(day)
+            if target == _cache_key:
+                return _cache_val
+            # Inline bisect_right over the packed keys: find last entry <= target
+            key = _key
+            lo = 0
+            hi = len(key)
+            while lo < hi:
+                mid = (lo + hi) >> 1
+                if key[mid] <= target:
+                    lo = mid + 1
                 else:
-                    break
-            if last_idx == -1:
-                last_idx = len(_entries) - 1  # wrap to last available (previous year assumption)
-            dd, mm, rh, rm, sh, sm = _entries[last_idx]
-            return rh, rm, sh, sm
+                    hi = mid
+            # lo == 0 gives -1: wrap to last available (previous year assumption)
+            i = lo - 1
+            _cache_val = (_rh[i], _rm[i], _sh[i], _sm[i])
+            _cache_key = target
+            return _cache_val
     except Exception as e:
         # Log error but continue with fallback
         print(f"[SUN_TIMES] Error getting sunrise/sunset: {e}")
@@ -163,11 +428,13 @@ def get_sunrise_sunset(month, day):
 
 def get_debug_info():
     """Get debug information about loaded sun times data."""
+    if _loaded is None:
+        _ensure_loaded()
     return {
         'loaded': _loaded,
-        'entries_count': len(_entries),
+        'entries_count': len(_key),
         'location': _location,
         'lat': _lat,
         'lon': _lon,
-        'sorted_keys': _sorted_keys[:5]  # First 5 keys for debugging
+        'sorted_keys': [(_dd[i], _mm[i]) for i in range(min(5, len(_key)))]  # First 5 (dd, mm) keys for debugging
     }
\ No newline at end of file
@@ -13,6 +13,14 @@ from simple_logger import Logger
 
 log = Logger()
 
+_WINDOW_NAME_CACHE_MAX = 32
+
+# How long a built status dict is reused for back-to-back polls (ms)
+_STATUS_TTL_MS = 1000
+
+# lib.wifi_connect.get_network_status, bound by get_network_info() on first use
+_get_network_status = None
+
 class SystemStatus:
     """
     Tracks and provides current system status information.
@@ -22,8 +30,18 @@ class SystemStatus:
     """
     
     def __init__(self):
-        self.startup_time = time.time()
+        # Uptime is accumulated from ticks_ms() deltas: unlike time.time() it
+        # does not jump when NTP sets the clock. Every sample (status polls,
+        # PWM updates) must be less than half a ticks period (~6 days) apart.
+        self._uptime_ms = 0
+        self._uptime_ticks = time.ticks_ms()
+        self._uptime_text = None  # last get_uptime_string() result ...
+        self._uptime_text_secs = -1  # ... and the whole second it was rendered for
         self.pin_status = {}  # {pin_key: {name, duty_cycle, window, window_start, window_end, gpio_pin}}
+        # Display form of pin_status, kept up to date by update_multi_pin_status
+        # and served as-is by get_status_dict (read-only for callers)
+        self._pin_display = {}
+        self._window_names = {}  # {raw window name: display name}
         self.last_update_time = 0
         self.total_updates = 0
         self.error_count = 0
@@ -31,42 +49,79 @@ class SystemStatus:
         self.wifi_connected = False
         self.mqtt_connected = False
         self.web_server_running = False
+        # Last get_status_dict() result and when it was built (ticks_ms);
+        # the state setters below drop it so changes show up immediately
+        self._status_cache = None
+        self._status_cache_ticks = 0
+        self._time_tuple = None  # RTC reading behind the last time info
+        self._sun_src = None  # last sun_times.get_sunrise_sunset() result ...
+        self._sun_text = None  # ... and its ("HH:MM" sunrise, "HH:MM" sunset)
     
     def update_multi_pin_status(self, pin_updates):
         """
         Update status for multiple PWM pins.
         
         Args:
-            pin_updates (dict): {pin_key: {name, window, duty_cycle, window_start, window_end}}
+            pin_updates (dict): {pin_key: {name, window, duty_cycle, window_start,
+                window_end[, gpio_pin]}}
         """
-        # Add GPIO pin information from config
-        config_dict = config_manager.get_config_dict()
-        pwm_pins = config_dict.get('pwm_pins', {})
+        pwm_pins = None
         
         for pin_key, update_info in pin_updates.items():
-            pin_config = pwm_pins.get(pin_key, {})
-            gpio_pin = pin_config.get('gpio_pin')
+            gpio_pin = update_info.get('gpio_pin')
+            if gpio_pin is None:
+                # Caller did not pass the pin; fall back to the config lookup
+                if pwm_pins is None:
+                    pwm_pins = config_manager.get_config_view().get('pwm_pins') or {}
+                gpio_pin = pwm_pins.get(pin_key, {}).get('gpio_pin')
+            
+            name = update_info.get('name', pin_key)
+            duty_cycle = update_info.get('duty_cycle', 0)
+            window = update_info.get('window')
+            window_start = update_info.get('window_start')
+            window_end = update_info.get('window_end')
             
             self.pin_status[pin_key] = {
-                'name': update_info.get('name', pin_key),
-                'duty_cycle': update_info.get('duty_cycle', 0),
-                'window': update_info.get('window'),
-                'window_start': update_info.get('window_start'),
-                'window_end': update_info.get('window_end'),
+                'name': name,
+                'duty_cycle': duty_cycle,
+                'window': window,
+                'window_start': window_start,
+                'window_end': window_end,
                 'gpio_pin': gpio_pin
             }
+            
+            # Update the display entry in place; the window name is only
+            # reformatted when the window changes
+            display = self._pin_display.get(pin_key)
+            if display is None:
+                display = self._pin_display[pin_key] = {'window': None, 'window_display': "None"}
+            if display['window'] != window:
+                display['window'] = window
+                display['window_display'] = self._safe_format_window_name(window)
+            display['name'] = name
+            display['gpio_pin'] = gpio_pin
+            display['duty_cycle'] = duty_cycle
+            display['duty_cycle_display'] = f"{duty_cycle}%"
+            display['status'] = "ON" if duty_cycle > 0 else "OFF"
+            display['window_start'] = window_start
+            display['window_end'] = window_end
         
         # Remove pins that are no longer in the update
         current_pins = set(pin_updates.keys())
         stored_pins = set(self.pin_status.keys())
         for removed_pin in stored_pins - current_pins:
             del self.pin_status[removed_pin]
+            del self._pin_display[removed_pin]
         
         self.last_update_time = time.time()
         self.total_updates += 1
+        # Keep the uptime counter sampled even if no one polls status
+        self._uptime_now_ms()
+        self._status_cache = None
         
-        active_count = sum(1 for info in pin_updates.values() if info.get('duty_cycle', 0) > 0)
-        log.debug(f"[STATUS] Updated {len(pin_updates)} pins, {active_count} active")
+        if log.debug_enabled:
+            active_count = sum(1 for info in pin_updates.values() if info.get('duty_cycle', 0) > 0)
+            log.debug(f"[STATUS] Updated {len(pin_updates)} pins, {active_count} active")
     
     def record_error(self, error_message):
         """
@@ -80,7 +135,9 @@ class SystemStatus:
             "message": error_message,
             "timestamp": time.time()
         }
-        log.debug(f"[STATUS] Error recorded: {error_message}")
+        self._status_cache = None
+        if log.debug_enabled:
+            log.debug(f"[STATUS] Error recorded: {error_message}")
     
     def set_connection_status(self, wifi=None, mqtt=None, web_server=None):
         """
@@ -97,6 +154,7 @@ class SystemStatus:
             self.mqtt_connected = mqtt
         if web_server is not None:
             self.web_server_running = web_server
+        self._status_cache = None
     
     def get_current_time_info(self):
         """
@@ -106,25 +164,27 @@ class SystemStatus:
             dict: Time information including current time, sunrise, sunset
         """
         try:
-            current_time_tuple = rtc_module.get_current_time()
-            month = current_time_tuple[1]
-            day = current_time_tuple[2]
+            self._time_tuple = current_time = rtc_module.get_current_time()
+            year, month, day, hour, minute, second, _ = current_time
             
-            # Get sunrise/sunset times
-            sunrise_h, sunrise_m, sunset_h, sunset_m = sun_times.get_sunrise_sunset(month, day)
-            
-            # Format current time
-            current_time_str = f"{current_time_tuple[3]:02d}:{current_time_tuple[4]:02d}:{current_time_tuple[5]:02d}"
-            current_date_str = f"{current_time_tuple[2]:02d}/{current_time_tuple[1]:02d}/{current_time_tuple[0]}"
+            # Get sunrise/sunset times. sun_times hands back the same tuple for
+            # as long as the date (and loaded table) is unchanged, so the
+            # formatted pair is only rebuilt when that tuple changes.
+            sun = sun_times.get_sunrise_sunset(month, day)
+            if sun is not self._sun_src:
+                self._sun_text = ("%02d:%02d" % sun[:2], "%02d:%02d" % sun[2:])
+                self._sun_src = sun
             
+            # %-formatting takes MicroPython's simpler C path than format specs
             return {
-                "current_time": current_time_str,
-                "current_date": current_date_str,
-                "sunrise_time": f"{sunrise_h:02d}:{sunrise_m:02d}",
-                "sunset_time": f"{sunset_h:02d}:{sunset_m:02d}",
+                "current_time": "%02d:%02d:%02d" % (hour, minute, second),
+                "current_date": "%02d/%02d/%d" % (day, month, year),
+                "sunrise_time": self._sun_text[0],
+                "sunset_time": self._sun_text[1],
                 "timezone": config_manager.TIMEZONE_NAME
             }
         except Exception as e:
+            self._time_tuple = None
             log.error(f"[STATUS] Error getting time info: {e}")
             return {
                 "current_time": "Unknown",
@@ -134,14 +194,21 @@ class SystemStatus:
                 "timezone": "Unknown"
             }
     
+    def _uptime_now_ms(self):
+        """Fold the ticks elapsed since the last sample into the uptime (ms)."""
+        now = time.ticks_ms()
+        self._uptime_ms += time.ticks_diff(now, self._uptime_ticks)
+        self._uptime_ticks = now
+        return self._uptime_ms
+    
     def get_uptime(self):
         """
         Get system uptime in seconds.
         
         Returns:
-            float: Uptime in seconds
+            float: Uptime in seconds, with millisecond resolution
         """
-        return time.time() - self.startup_time
+        return self._uptime_now_ms() / 1000
     
     def get_uptime_string(self):
         """
@@ -150,21 +217,26 @@ class SystemStatus:
         Returns:
             str: Human-readable uptime
         """
-        uptime_seconds = self.get_uptime()
-        
-        days = int(uptime_seconds // 86400)
-        hours = int((uptime_seconds % 86400) // 3600)
-        minutes = int((uptime_seconds % 3600) // 60)
-        seconds = int(uptime_seconds % 60)
-        
-        if days > 0:
-            return f"{days}d {hours}h {minutes}m {seconds}s"
-        elif hours > 0:
-            return f"{hours}h {minutes}m {seconds}s"
-        elif minutes > 0:
-            return f"{minutes}m {seconds}s"
+        total = self._uptime_now_ms() // 1000
+        # The text only changes once a second; reuse it within the same second
+        if total == self._uptime_text_secs:
+            return self._uptime_text
+        minutes, seconds = divmod(total, 60)
+        if not minutes:
+            text = f"{seconds}s"
         else:
-            return f"{seconds}s"
+            hours, minutes = divmod(minutes, 60)
+            if not hours:
+                text = f"{minutes}m {seconds}s"
+            else:
+                days, hours = divmod(hours, 24)
+                if not days:
+                    text = f"{hours}h {minutes}m {seconds}s"
+                else:
+                    text = f"{days}d {hours}h {minutes}m {seconds}s"
+        self._uptime_text = text
+        self._uptime_text_secs = total
+        return text
     
     def get_network_info(self):
         """
@@ -173,10 +245,12 @@ class SystemStatus:
         Returns:
             dict: Network status information
         """
+        global _get_network_status
         try:
-            # Import here to avoid circular imports
-            from lib.wifi_connect import get_network_status
-            return get_network_status()
+            if _get_network_status is None:
+                # Imported on first use to avoid circular imports
+                from lib.wifi_connect import get_network_status as _get_network_status
+            return _get_network_status()
         except Exception as e:
             log.error(f"[STATUS] Error getting network info: {e}")
             return {
@@ -193,9 +267,35 @@ class SystemStatus:
         """
         Get complete system status as dictionary.
         
+        Polls arriving within _STATUS_TTL_MS of each other share one build
+        (RTC read, sun lookup, WLAN query); treat the result as read-only.
+        
         Returns:
             dict: Complete system status information
         """
+        now = time.ticks_ms()
+        if (self._status_cache is None or
+                time.ticks_diff(now, self._status_cache_ticks) >= _STATUS_TTL_MS):
+            self._status_cache = self._build_status_dict()
+            self._status_cache_ticks = now
+        return self._status_cache
+    
+    def get_status_snapshot(self):
+        """
+        Get the status dict together with the RTC reading it was built from.
+        
+        Lets a page that needs both the raw time and the status do one RTC
+        read instead of two.
+        
+        Returns:
+            tuple: (time tuple from rtc_module.get_current_time(), or None if
+                the RTC read failed, status dict)
+        """
+        status = self.get_status_dict()
+        return self._time_tuple, status
+    
+    def _build_status_dict(self):
+        """Assemble the status dictionary served by get_status_dict()."""
         time_info = self.get_current_time_info()
         network_info = self.get_network_info()
         
@@ -207,10 +307,8 @@ class SystemStatus:
             try:
                 from lib.pwm_control import multi_pwm
                 pwm_status = multi_pwm.get_pin_status()
-                config_dict = config_manager.get_config_dict()
                 
                 for pin_key, pin_info in pwm_status.items():
-                    pin_config = config_dict.get('pwm_pins', {}).get(pin_key, {})
                     duty_percent = pin_info.get('duty_percent', 0)
                     
                     pins_display[pin_key] = {
@@ -227,19 +325,8 @@ class SystemStatus:
             except Exception as e:
                 log.error(f"[STATUS] Error getting PWM status: {e}")
         else:
-            # Use existing pin_status data
-            for pin_key, pin_info in self.pin_status.items():
-                pins_display[pin_key] = {
-                    'name': pin_info.get('name', pin_key),
-                    'gpio_pin': pin_info.get('gpio_pin'),
-                    'duty_cycle': pin_info.get('duty_cycle', 0),
-                    'duty_cycle_display': f"{pin_info.get('duty_cycle', 0)}%",
-                    'status': "ON" if pin_info.get('duty_cycle', 0) > 0 else "OFF",
-                    'window': pin_info.get('window'),
-                    'window_display': self._safe_format_window_name(pin_info.get('window')),
-                    'window_start': pin_info.get('window_start'),
-                    'window_end': pin_info.get('window_end')
-                }
+            # Maintained by update_multi_pin_status
+            pins_display = self._pin_display
         
         return {
             "system": {
@@ -274,6 +361,19 @@ class SystemStatus:
         Returns:
             str: Formatted window name
         """
+        cached = self._window_names.get(window_name)
+        if cached is not None:
+            return cached
+        formatted = self._format_window_name(window_name)
+        # Window names come from config and repeat daily, so this stays tiny;
+        # the bound only guards against a pathological config
+        if len(self._window_names) >= _WINDOW_NAME_CACHE_MAX:
+            self._window_names.clear()
+        self._window_names[window_name] = formatted
+        return formatted
+    
+    def _format_window_name(self, window_name):
+        """Uncached formatting behind _safe_format_window_name."""
         try:
             if not window_name:
                 return "None"
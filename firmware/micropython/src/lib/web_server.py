@@ -5,19 +5,38 @@ Provides basic web interface for system status without complex endpoints.
 """
 
 import asyncio
-import socket
+import gc
 import json
 import os
 from simple_logger import Logger
 from lib import config_manager as config
 from lib.system_status import system_status
 from lib.pwm_control import multi_pwm
+from lib import sun_times
 import rtc_module
 import time
 import machine
+from micropython import const
 
 log = Logger()
 
+# /api/status only forces a full GC when free heap is below this (bytes);
+# above it the reading is taken as-is so a status poll never stalls on a sweep
+_GC_LOW_WATER = const(32768)
+
+# Main-page connection badges, encoded once at import. WiFi is indexed by
+# connected (False/True); MQTT by 0 = disabled, 1 = offline, 2 = connected.
+_WIFI_BADGE_OPEN = (
+    '<div class="status offline"><strong>📶 WiFi:</strong> '.encode('utf-8'),
+    '<div class="status online"><strong>📶 WiFi:</strong> '.encode('utf-8'),
+)
+_MQTT_BADGE = (
+    '<div class="status disabled"><strong>🔌 MQTT:</strong> Disabled</div>'.encode('utf-8'),
+    '<div class="status offline"><strong>🔌 MQTT:</strong> Offline</div>'.encode('utf-8'),
+    '<div class="status online"><strong>🔌 MQTT:</strong> Connected</div>'.encode('utf-8'),
+)
+_CONTROLLERS_H2 = "<h2>🎛️ Controllers</h2>".encode('utf-8')
+
 class AsyncWebServer:
     """
     Simple async web server for PagodaLightPico.
@@ -27,19 +46,29 @@ class AsyncWebServer:
     def __init__(self, port=80):
         self.port = port
         self.running = False
-        self.server_socket = None
+        self._server = None
         self._cleanup_task_handle = None
+        # /status document, refilled in place, and the JSON last serialized
+        # from it along with the status dict it was built from
+        self._status_doc = {'timestamp': 0, 'current_time': {}, 'memory': {}}
+        self._status_body = None
+        self._status_src = None
+        # Buffered responses that take no request data, for any method;
+        # streamed pages and uploads are dispatched in handle_client
+        self._routes = {
+            '/status': self.generate_status_json,
+            '/download-config': self.generate_config_download,
+            '/download-sun-times': self.generate_sun_times_download,
+            # Show restart page and schedule hard reset
+            '/restart': self.generate_restart_page,
+        }
     
     async def start(self):
         """Start the web server."""
         try:
             log.info(f"[WEB] Starting async web server on port {self.port}")
-            # Create server socket
-            self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self.server_socket.setblocking(False)
-            self.server_socket.bind(('0.0.0.0', self.port))
-            self.server_socket.listen(1)
+            # The event loop wakes handle_client only when a connection is ready
+            self._server = await asyncio.start_server(self.handle_client, '0.0.0.0', self.port, backlog=1)
             
             self.running = True
             # Cleanup abandoned uploads on startup
@@ -71,11 +100,12 @@ class AsyncWebServer:
                 self._cleanup_task_handle = None
         except Exception:
             pass
-        if self.server_socket:
+        if self._server:
             try:
-                self.server_socket.close()
+                self._server.close()
             except:
                 pass
+            self._server = None
         log.info("[WEB] Web server stopped")
 
     def _cleanup_stale_uploads(self, max_age_seconds=15*60):
@@ -136,184 +166,121 @@ class AsyncWebServer:
             pass
     
     async def serve_forever(self):
-        """Main server loop."""
-        if not self.running:
+        """Wait on the listening server until stop() closes it."""
+        if not self.running or self._server is None:
             return
             
         log.info("[WEB] Starting server loop")
+        try:
+            await self._server.wait_closed()
+        except Exception as e:
+            log.error(f"[WEB] Server loop error: {e}")
+    
+    async def _read_request(self, reader):
+        """
+        Read the request head line by line, then exactly Content-Length body bytes.
         
-        while self.running:
-            try:
-                # Accept connections with timeout
+        Returns (request line, remaining header lines, body); the header
+        lines keep their CRLFs and stay undecoded.
+        """
+        request_line = await reader.readline()
+        head = bytearray()
+        content_length = 0
+        while request_line:
+            line = await reader.readline()
+            if not line or line == b'\r\n':
+                break
+            if line[:15].lower() == b'content-length:':
                 try:
-                    client_socket, addr = self.server_socket.accept()
-                    client_socket.setblocking(False)
-                    log.debug(f"[WEB] Connection from {addr}")
-                    
-                    # Handle client in separate task
-                    asyncio.create_task(self.handle_client(client_socket, addr))
-                    
-                except OSError:
-                    # No connection available, yield control
-                    await asyncio.sleep(config.SERVER_IDLE_SLEEP_MS / 1000.0)
-                    continue
-                    
-            except Exception as e:
-                log.error(f"[WEB] Server loop error: {e}")
-                await asyncio.sleep(1)
-    
-    async def handle_client(self, client_socket, addr):
+                    content_length = int(line[15:].strip())
+                except ValueError:
+                    content_length = 0
+            head.extend(line)
+        body = await reader.readexactly(content_length) if content_length > 0 else b''
+        return request_line, head, body
+
+    def _request_text(self, request_line, head, body_bytes):
+        """Rebuild the whole request as text for the legacy multipart handlers."""
+        request_data = request_line + bytes(head) + b'\r\n' + body_bytes
+        try:
+            return request_data.decode('utf-8')
+        except:
+            # If decode fails, try with latin-1 which accepts all byte values
+            return request_data.decode('latin-1')
+
+    async def handle_client(self, reader, writer):
         """Handle a client connection."""
         try:
             # Read request with timeout
-            request_data = b""
-            start_time = time.time()
-            
-            # First read until headers are complete (\r\n\r\n)
-            headers_end = -1
-            while time.time() - start_time < 5:  # 5 second timeout
-                try:
-                    chunk = client_socket.recv(1024)
-                    if not chunk:
-                        break
-                    request_data += chunk
-                    if b'\r\n\r\n' in request_data:
-                        headers_end = request_data.find(b'\r\n\r\n')
-                        break
-                except OSError:
-                    await asyncio.sleep(config.CLIENT_READ_SLEEP_MS / 1000.0)
-                    continue
-            
-            if not request_data:
+            try:
+                request_line, head, body_bytes = await asyncio.wait_for(self._read_request(reader), 5)
+            except (asyncio.TimeoutError, EOFError):
                 return
             
-            # If we have headers, check for Content-Length and read the body fully
-            if headers_end != -1:
-                headers_bytes = request_data[:headers_end]
-                # Decode headers permissively
-                try:
-                    headers_text = headers_bytes.decode('utf-8')
-                except:
-                    headers_text = headers_bytes.decode('latin-1')
-
-                content_length = 0
-                for hline in headers_text.split('\r\n'):
-                    if hline.lower().startswith('content-length:'):
-                        try:
-                            content_length = int(hline.split(':', 1)[1].strip())
-                        except:
-                            content_length = 0
-                        break
-
-                total_expected = headers_end + 4 + content_length
-                # Read remaining body if any
-                while len(request_data) < total_expected and (time.time() - start_time) < 5:
-                    try:
-                        chunk = client_socket.recv(1024)
-                        if not chunk:
-                            break
-                        request_data += chunk
-                    except OSError:
-                        await asyncio.sleep(config.CLIENT_READ_SLEEP_MS / 1000.0)
-                        continue
-
-            # Parse request (headers + body)
+            # Routing needs only "METHOD PATH"; the headers are never decoded
             try:
-                request_str = request_data.decode('utf-8')
-            except:
-                # If decode fails, try with latin-1 which accepts all byte values
-                request_str = request_data.decode('latin-1')
-            lines = request_str.split('\r\n')
-            if not lines:
+                parts = request_line.decode('ascii').split(' ', 2)
+            except ValueError:
                 return
-                
-            request_line = lines[0]
-            parts = request_line.split(' ')
             if len(parts) < 2:
                 return
                 
             method = parts[0]
             path = parts[1]
-            # Extract headers text and body bytes for binary-safe handlers
-            headers_text = ''
-            body_bytes = b''
-            if headers_end != -1:
-                try:
-                    headers_text = request_data[:headers_end].decode('utf-8')
-                except:
-                    headers_text = request_data[:headers_end].decode('latin-1')
-                body_bytes = request_data[headers_end+4: headers_end+4+content_length]
-            
-            log.debug(f"[WEB] {method} {path} from {addr}")
+            if log.debug_enabled:
+                log.debug(f"[WEB] {method} {path} from {writer.get_extra_info('peername')}")
             
             # Generate response
-            if path == '/':
+            handler = self._routes.get(path)
+            if handler is not None:
+                response = handler()
+            elif path == '/':
                 # Stream the main page directly to the client to minimize memory usage
-                await self.stream_main_page(client_socket)
+                await self.stream_main_page(writer)
                 response = None
-            elif path == '/status':
-                response = self.generate_status_json()
-            elif path == '/download-config':
-                response = self.generate_config_download()
-            elif path == '/download-sun-times':
-                response = self.generate_sun_times_download()
             elif path == '/upload-config-begin' and method == 'POST':
                 response = self.handle_config_upload_begin()
             elif path == '/upload-config-chunk' and method == 'POST':
-                response = self.handle_config_upload_chunk(body_bytes, headers_text)
+                response = self.handle_config_upload_chunk(body_bytes)
             elif path == '/upload-config-finalize' and method == 'POST':
-                response = await self.handle_config_upload_finalize(request_str)
+                response = await self.handle_config_upload_finalize()
             elif path == '/upload-config':
                 if method == 'GET':
                     # Stream the chunked-upload page to minimize memory usage
-                    await self.stream_upload_page_chunked(client_socket)
+                    await self.stream_upload_page_chunked(writer)
                     response = None
                 elif method == 'POST':
-                    response = await self.handle_config_upload(request_str)
+                    response = await self.handle_config_upload(self._request_text(request_line, head, body_bytes))
                 else:
                     response = self.generate_404()
             elif path == '/upload-sun-times-begin' and method == 'POST':
                 response = self.handle_sun_times_upload_begin()
             elif path == '/upload-sun-times-chunk' and method == 'POST':
-                response = self.handle_sun_times_upload_chunk(body_bytes, headers_text)
+                response = self.handle_sun_times_upload_chunk(body_bytes)
             elif path == '/upload-sun-times-finalize' and method == 'POST':
                 response = await self.handle_sun_times_upload_finalize()
             elif path == '/upload-sun-times':
                 if method == 'GET':
                     # Stream the sun times upload page to minimize memory usage
-                    await self.stream_upload_sun_times_page_chunked(client_socket)
+                    await self.stream_upload_sun_times_page_chunked(writer)
                     response = None
                 elif method == 'POST':
                     # Legacy multipart handler
-                    response = await self.handle_sun_times_upload(request_str)
+                    response = await self.handle_sun_times_upload(self._request_text(request_line, head, body_bytes))
                 else:
                     response = self.generate_404()
-            elif path == '/restart':
-                # Show restart page and schedule hard reset
-                response = self.generate_restart_page()
             else:
                 response = self.generate_404()
             
             # Send response (ensure full bytes are sent)
             try:
                 if response is not None:
-                    if isinstance(response, str):
-                        response_bytes = response.encode('utf-8')
-                    else:
-                        response_bytes = response
-                    total_sent = 0
-                    while total_sent < len(response_bytes):
-                        try:
-                            sent = client_socket.send(response_bytes[total_sent:])
-                            if sent is None:
-                                sent = 0
-                            if sent <= 0:
-                                break
-                            total_sent += sent
-                        except OSError:
-                            # Briefly yield and retry
-                            await asyncio.sleep(0.01)
-                            continue
+                    # Header and body go out as separate writes; drain() yields between them
+                    for part in (response if isinstance(response, tuple) else (response,)):
+                        if isinstance(part, str):
+                            part = part.encode('utf-8')
+                        writer.write(part)
+                        await writer.drain()
             except Exception:
                 pass  # Client disconnected or other send error
                 
@@ -321,31 +288,29 @@ class AsyncWebServer:
             log.error(f"[WEB] Client handling error: {e}")
         finally:
             try:
-                client_socket.close()
+                writer.close()
+                await writer.wait_closed()
             except:
                 pass
     
     def generate_main_page(self):
         """Generate simple main page."""
         try:
-            current_time = rtc_module.get_current_time()
+            # One RTC read serves both the status dict and the page clock
+            current_time, status = system_status.get_status_snapshot()
+            if current_time is None:
+                current_time = rtc_module.get_current_time()
             time_str = f"{current_time[3]:02d}:{current_time[4]:02d}:{current_time[5]:02d}"
             date_str = f"{current_time[2]:02d}/{current_time[1]:02d}/{current_time[0]}"
 
-            status = system_status.get_status_dict()
             
             # Get PWM controller status and full config for including disabled controllers
             pwm_status = multi_pwm.get_pin_status()
-            config_dict = config.config_manager.get_config_dict()
+            config_dict = config.config_manager.get_config_view()
             # Current config version for display
             current_config_version = str(config_dict.get('version', '')).strip() or 'unknown'
-            # Read location from sun_times.json (if available)
-            try:
-                with open('sun_times.json', 'r') as f:
-                    _st = json.loads(f.read())
-                ui_location = str(_st.get('location', 'Unknown')).strip() or 'Unknown'
-            except Exception:
-                ui_location = 'Unknown'
+            # Location as already loaded by sun_times, not a re-parse of the file
+            ui_location = str(sun_times.get_location_info()[0] or '').strip() or 'Unknown'
 
             # Build Controllers table HTML (include disabled pins too)
             pwm_table_rows = ""
@@ -635,162 +600,136 @@ class AsyncWebServer:
     </body>
     </html>"""
 
-            # Ensure Content-Length matches bytes actually sent
-            body_bytes = html.encode('utf-8')
-            headers = f"HTTP/1.1 200 OK\r\nContent-Type: text/html; charset=utf-8\r\nContent-Length: {len(body_bytes)}\r\nConnection: close\r\n\r\n"
-            return headers + html
+            return self._http_response("200 OK", html)
 
         except Exception as e:
             log.error(f"[WEB] Error generating main page: {e}")
             return self.generate_500()
 
-    async def _awrite(self, sock, data_bytes):
-        """Asynchronously write all bytes to the socket in small chunks."""
+    async def _awrite(self, writer, data_bytes):
+        """Write bytes to the client stream, yielding until the socket drains."""
         try:
-            total_sent = 0
-            ln = len(data_bytes)
-            while total_sent < ln:
-                try:
-                    sent = sock.send(data_bytes[total_sent:])
-                    if sent is None:
-                        sent = 0
-                    if sent <= 0:
-                        # Yield and retry
-                        await asyncio.sleep(0.005)
-                        continue
-                    total_sent += sent
-                except OSError:
-                    await asyncio.sleep(0.005)
-                    continue
+            writer.write(data_bytes)
+            await writer.drain()
         except Exception:
             pass
 
-    async def stream_main_page(self, client_socket):
+    async def stream_main_page(self, writer):
         """Stream the main page in small chunks without computing Content-Length."""
         try:
-            current_time = rtc_module.get_current_time()
+            # One RTC read serves both the status dict and the page clock
+            current_time, status = system_status.get_status_snapshot()
+            if current_time is None:
+                current_time = rtc_module.get_current_time()
             time_str = f"{current_time[3]:02d}:{current_time[4]:02d}:{current_time[5]:02d}"
             date_str = f"{current_time[2]:02d}/{current_time[1]:02d}/{current_time[0]}"
 
-            status = system_status.get_status_dict()
             pwm_status = multi_pwm.get_pin_status()
-            config_dict = config.config_manager.get_config_dict()
+            config_dict = config.config_manager.get_config_view()
             current_config_version = str(config_dict.get('version', '')).strip() or 'unknown'
-            # UI location from sun_times.json
-            try:
-                with open('sun_times.json', 'r') as f:
-                    _st = json.loads(f.read())
-                ui_location = str(_st.get('location', 'Unknown')).strip() or 'Unknown'
-            except Exception:
-                ui_location = 'Unknown'
+            # Location as already loaded by sun_times, not a re-parse of the file
+            ui_location = str(sun_times.get_location_info()[0] or '').strip() or 'Unknown'
 
-            mqtt_enabled = config_dict.get('notifications', {}).get('enabled', False)
-            mqtt_connected = status.get('connections', {}).get('mqtt', False)
-            if not mqtt_enabled:
-                mqtt_status = "Disabled"
-                mqtt_class = "disabled"
-            elif mqtt_connected:
-                mqtt_status = "Connected"
-                mqtt_class = "online"
+            connections = status.get('connections', {})
+            if not config_dict.get('notifications', {}).get('enabled', False):
+                mqtt_state = 0
             else:
-                mqtt_status = "Offline"
-                mqtt_class = "offline"
+                mqtt_state = 2 if connections.get('mqtt', False) else 1
 
-            # Headers (no Content-Length)
-            headers = (
-                "HTTP/1.1 200 OK\r\n"
-                "Content-Type: text/html; charset=utf-8\r\n"
-                "Connection: close\r\n\r\n"
-            )
-            await self._awrite(client_socket, headers.encode('utf-8'))
+            # The static parts below are bytes literals: nothing to encode per
+            # request, and in a frozen build they are read straight from flash
 
-            # Head start + styles (small chunks)
-            await self._awrite(client_socket, b"<!DOCTYPE html><html><head>")
-            await self._awrite(client_socket, f"<title>{config.WEB_TITLE}</title>".encode('utf-8'))
-            await self._awrite(client_socket, b"<meta name=\"viewport\" content=\"width=device-width, initial-scale=1\">")
+            # Headers (no Content-Length) and head start
+            await self._awrite(writer, (
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: text/html; charset=utf-8\r\n"
+                b"Connection: close\r\n\r\n"
+                b"<!DOCTYPE html><html><head>"
+            ))
+            await self._awrite(writer, f"<title>{config.WEB_TITLE}</title>".encode('utf-8'))
+            await self._awrite(writer, b"<meta name=\"viewport\" content=\"width=device-width, initial-scale=1\">")
 
             style = (
-                "<style>"
-                "body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, 'Noto Sans', 'Liberation Sans', sans-serif, 'Apple Color Emoji', 'Segoe UI Emoji', 'Noto Color Emoji'; margin: 20px; background: #f5f5f5; }"
-                ".container { max-width: 800px; margin: 0 auto; background: white; padding: 20px; border-radius: 8px; }"
-                "h1 { color: #2c3e50; text-align: center; }"
-                "h2 { color: #34495e; margin-top: 30px; }"
-                ".status { padding: 10px; margin: 10px 0; border-radius: 5px; }"
-                ".online { background: #d4edda; border-left: 4px solid #28a745; }"
-                ".offline { background: #f8d7da; border-left: 4px solid #dc3545; }"
-                ".disabled { background: #fff3cd; border-left: 4px solid #ffc107; }"
-                ".time { font-size: 24px; text-align: center; margin: 20px 0; color: #2c3e50; }"
-                ".pwm-table { width: 100%; border-collapse: collapse; margin: 20px 0; }"
-                ".pwm-table th, .pwm-table td { padding: 8px 12px; text-align: left; border-bottom: 1px solid #ddd; }"
-                ".pwm-table th { background-color: #f8f9fa; font-weight: bold; }"
-                ".pwm-table tr.active { background-color: #d4edda; }"
-                ".pwm-table tr.inactive { background-color: #f8f9fa; }"
-                ".pwm-table tr.disabled { background-color: #ffe0b2; }"
-                ".table-responsive { width: 100%; position: relative; }"
-                ".table-scroll { width: 100%; overflow-x: auto; -webkit-overflow-scrolling: touch; }"
-                ".table-responsive::after{content:'';position:absolute;top:0;right:0;width:36px;height:100%;pointer-events:none;background:linear-gradient(to left, rgba(255,255,255,1), rgba(255,255,255,0));opacity:0;transition:opacity 0.15s linear;z-index:1;}"
-                ".table-responsive::before{content:'';position:absolute;top:0;left:0;width:36px;height:100%;pointer-events:none;background:linear-gradient(to right, rgba(255,255,255,1), rgba(255,255,255,0));opacity:0;transition:opacity 0.15s linear;z-index:1;}"
-                ".table-responsive.has-right::after{opacity:1;}"
-                ".table-responsive.has-left::before{opacity:1;}"
-                ".pwm-table { min-width: 560px; }"
-                ".footer { text-align: center; margin-top: 30px; padding-top: 20px; border-top: 1px solid #ddd; }"
-                ".footer a { color: #007bff; text-decoration: none; }"
-                ".footer a:hover { text-decoration: underline; }"
-                ".refresh-info { font-size: 11px; color: #999; margin-top: 10px; }"
-                ".footer-grid { display: grid; grid-template-columns: repeat(4, minmax(0, 1fr)); gap: 8px 16px; align-items: start; padding: 0; margin: 8px 0 0 0; }"
-                ".footer-grid .col { display: flex; flex-direction: column; gap: 6px; }"
-                ".footer .col-title { font-size: 12px; color: #555; text-transform: uppercase; letter-spacing: 0.03em; }"
-                ".version { background: #e9ecef; border-left: 4px solid #6c757d; }"
-                ".location { background: #e7f3ff; border-left: 4px solid #0d6efd; }"
-                "@media (max-width: 480px){.container{padding:12px;}.pwm-table th,.pwm-table td{padding:6px 8px;font-size:12px;}}"
-                "@media (max-width: 420px){.pwm-table th:nth-child(2),.pwm-table td:nth-child(2),.pwm-table th:nth-child(5),.pwm-table td:nth-child(5){display:none;}}"
-                "</style>"
+                b"<style>"
+                b"body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, 'Noto Sans', 'Liberation Sans', sans-serif, 'Apple Color Emoji', 'Segoe UI Emoji', 'Noto Color Emoji'; margin: 20px; background: #f5f5f5; }"
+                b".container { max-width: 800px; margin: 0 auto; background: white; padding: 20px; border-radius: 8px; }"
+                b"h1 { color: #2c3e50; text-align: center; }"
+                b"h2 { color: #34495e; margin-top: 30px; }"
+                b".status { padding: 10px; margin: 10px 0; border-radius: 5px; }"
+                b".online { background: #d4edda; border-left: 4px solid #28a745; }"
+                b".offline { background: #f8d7da; border-left: 4px solid #dc3545; }"
+                b".disabled { background: #fff3cd; border-left: 4px solid #ffc107; }"
+                b".time { font-size: 24px; text-align: center; margin: 20px 0; color: #2c3e50; }"
+                b".pwm-table { width: 100%; border-collapse: collapse; margin: 20px 0; }"
+                b".pwm-table th, .pwm-table td { padding: 8px 12px; text-align: left; border-bottom: 1px solid #ddd; }"
+                b".pwm-table th { background-color: #f8f9fa; font-weight: bold; }"
+                b".pwm-table tr.active { background-color: #d4edda; }"
+                b".pwm-table tr.inactive { background-color: #f8f9fa; }"
+                b".pwm-table tr.disabled { background-color: #ffe0b2; }"
+                b".table-responsive { width: 100%; position: relative; }"
+                b".table-scroll { width: 100%; overflow-x: auto; -webkit-overflow-scrolling: touch; }"
+                b".table-responsive::after{content:'';position:absolute;top:0;right:0;width:36px;height:100%;pointer-events:none;background:linear-gradient(to left, rgba(255,255,255,1), rgba(255,255,255,0));opacity:0;transition:opacity 0.15s linear;z-index:1;}"
+                b".table-responsive::before{content:'';position:absolute;top:0;left:0;width:36px;height:100%;pointer-events:none;background:linear-gradient(to right, rgba(255,255,255,1), rgba(255,255,255,0));opacity:0;transition:opacity 0.15s linear;z-index:1;}"
+                b".table-responsive.has-right::after{opacity:1;}"
+                b".table-responsive.has-left::before{opacity:1;}"
+                b".pwm-table { min-width: 560px; }"
+                b".footer { text-align: center; margin-top: 30px; padding-top: 20px; border-top: 1px solid #ddd; }"
+                b".footer a { color: #007bff; text-decoration: none; }"
+                b".footer a:hover { text-decoration: underline; }"
+                b".refresh-info { font-size: 11px; color: #999; margin-top: 10px; }"
+                b".footer-grid { display: grid; grid-template-columns: repeat(4, minmax(0, 1fr)); gap: 8px 16px; align-items: start; padding: 0; margin: 8px 0 0 0; }"
+                b".footer-grid .col { display: flex; flex-direction: column; gap: 6px; }"
+                b".footer .col-title { font-size: 12px; color: #555; text-transform: uppercase; letter-spacing: 0.03em; }"
+                b".version { background: #e9ecef; border-left: 4px solid #6c757d; }"
+                b".location { background: #e7f3ff; border-left: 4px solid #0d6efd; }"
+                b"@media (max-width: 480px){.container{padding:12px;}.pwm-table th,.pwm-table td{padding:6px 8px;font-size:12px;}}"
+                b"@media (max-width: 420px){.pwm-table th:nth-child(2),.pwm-table td:nth-child(2),.pwm-table th:nth-child(5),.pwm-table td:nth-child(5){display:none;}}"
+                b"</style>"
             )
-            await self._awrite(client_socket, style.encode('utf-8'))
+            await self._awrite(writer, style)
 
             # Script block
             script = (
-                "<script>let clockInterval;let refreshInterval;let countdownInterval;"
-                "function startClock(h,m,s){const timeEl=document.getElementById('time');function pad(n){return(n<10?'0':'')+n;}"
-                "function tick(){s+=1;if(s>=60){s=0;m+=1;}if(m>=60){m=0;h=(h+1)%24;}timeEl.textContent=pad(h)+':'+pad(m)+':'+pad(s);}" 
-                "tick();clockInterval=setInterval(tick,1000);}" 
-                "function startPageRefresh(){let s=180;function setT(){const e=document.getElementById('refresh-countdown');if(e){e.textContent='Next refresh in '+s+' seconds';return true}return false}" 
-                "if(!setT()){const w=setInterval(function(){if(setT())clearInterval(w)},200)}function upd(){s--;if(s<=0){location.reload();return}setT()}" 
-                "countdownInterval=setInterval(upd,1000);refreshInterval=setTimeout(function(){location.reload()},180000);}" 
-                "window.addEventListener('beforeunload',function(){if(clockInterval)clearInterval(clockInterval);if(refreshInterval)clearTimeout(refreshInterval);if(countdownInterval)clearInterval(countdownInterval);});" 
-                "function initTableFades(){const wrap=document.querySelector('.table-responsive');if(!wrap)return;const scroller=wrap.querySelector('.table-scroll')||wrap;function upd(){const max=scroller.scrollWidth-scroller.clientWidth;if(max<=0){wrap.classList.remove('has-left','has-right');return;}wrap.classList.toggle('has-left',scroller.scrollLeft>0);wrap.classList.toggle('has-right',scroller.scrollLeft<max-1);}scroller.addEventListener('scroll',upd,{passive:true});setTimeout(upd,0);}" 
-                "</script>"
+                b"<script>let clockInterval;let refreshInterval;let countdownInterval;"
+                b"function startClock(h,m,s){const timeEl=document.getElementById('time');function pad(n){return(n<10?'0':'')+n;}"
+                b"function tick(){s+=1;if(s>=60){s=0;m+=1;}if(m>=60){m=0;h=(h+1)%24;}timeEl.textContent=pad(h)+':'+pad(m)+':'+pad(s);}" 
+                b"tick();clockInterval=setInterval(tick,1000);}" 
+                b"function startPageRefresh(){let s=180;function setT(){const e=document.getElementById('refresh-countdown');if(e){e.textContent='Next refresh in '+s+' seconds';return true}return false}" 
+                b"if(!setT()){const w=setInterval(function(){if(setT())clearInterval(w)},200)}function upd(){s--;if(s<=0){location.reload();return}setT()}" 
+                b"countdownInterval=setInterval(upd,1000);refreshInterval=setTimeout(function(){location.reload()},180000);}" 
+                b"window.addEventListener('beforeunload',function(){if(clockInterval)clearInterval(clockInterval);if(refreshInterval)clearTimeout(refreshInterval);if(countdownInterval)clearInterval(countdownInterval);});" 
+                b"function initTableFades(){const wrap=document.querySelector('.table-responsive');if(!wrap)return;const scroller=wrap.querySelector('.table-scroll')||wrap;function upd(){const max=scroller.scrollWidth-scroller.clientWidth;if(max<=0){wrap.classList.remove('has-left','has-right');return;}wrap.classList.toggle('has-left',scroller.scrollLeft>0);wrap.classList.toggle('has-right',scroller.scrollLeft<max-1);}scroller.addEventListener('scroll',upd,{passive:true});setTimeout(upd,0);}" 
+                b"</script></head>"
             )
-            await self._awrite(client_socket, script.encode('utf-8'))
-            await self._awrite(client_socket, b"</head>")
+            await self._awrite(writer, script)
 
             # Body start
-            await self._awrite(client_socket, f"<body onload=\"startClock({current_time[3]}, {current_time[4]}, {current_time[5]}); startPageRefresh(); initTableFades();\"><div class=\"container\">".encode('utf-8'))
-            await self._awrite(client_socket, f"<h1>{config.WEB_TITLE}</h1>".encode('utf-8'))
-            await self._awrite(client_socket, f"<div class=\"time\">🕒 <span id=\"time\">{time_str}</span><br><small>{date_str}</small></div>".encode('utf-8'))
+            await self._awrite(writer, f"<body onload=\"startClock({current_time[3]}, {current_time[4]}, {current_time[5]}); startPageRefresh(); initTableFades();\"><div class=\"container\">".encode('utf-8'))
+            await self._awrite(writer, f"<h1>{config.WEB_TITLE}</h1>".encode('utf-8'))
+            await self._awrite(writer, f"<div class=\"time\">🕒 <span id=\"time\">{time_str}</span><br><small>{date_str}</small></div>".encode('utf-8'))
 
             # Version
-            await self._awrite(client_socket, f"<div class=\"status version\"><strong>🏷️ Config version:</strong> {current_config_version}</div>".encode('utf-8'))
+            await self._awrite(writer, f"<div class=\"status version\"><strong>🏷️ Config version:</strong> {current_config_version}</div>".encode('utf-8'))
             # Location
-            await self._awrite(client_socket, f"<div class=\"status location\"><strong>📍 Location:</strong> {ui_location}</div>".encode('utf-8'))
+            await self._awrite(writer, f"<div class=\"status location\"><strong>📍 Location:</strong> {ui_location}</div>".encode('utf-8'))
 
             # WiFi
-            wifi_class = 'online' if status.get('connections', {}).get('wifi', False) else 'offline'
             wifi_ssid = config_dict.get('wifi', {}).get('ssid', 'Unknown')
             wifi_ip = status.get('network', {}).get('ip', 'N/A')
-            await self._awrite(client_socket, f"<div class=\"status {wifi_class}\"><strong>📶 WiFi:</strong> {wifi_ssid}, {wifi_ip}</div>".encode('utf-8'))
+            await self._awrite(writer, _WIFI_BADGE_OPEN[bool(connections.get('wifi', False))])
+            await self._awrite(writer, f"{wifi_ssid}, {wifi_ip}</div>".encode('utf-8'))
 
             # MQTT
-            await self._awrite(client_socket, f"<div class=\"status {mqtt_class}\"><strong>🔌 MQTT:</strong> {mqtt_status}</div>".encode('utf-8'))
+            await self._awrite(writer, _MQTT_BADGE[mqtt_state])
 
             # Controllers table header
-            await self._awrite(client_socket, "<h2>🎛️ Controllers</h2>".encode('utf-8'))
-            await self._awrite(client_socket, "<div class=\"table-responsive\"><div class=\"table-scroll\">".encode('utf-8'))
-            await self._awrite(client_socket, (
-                "<table class=\"pwm-table\"><thead><tr>"
-                "<th>Name</th><th>Pin</th><th>Status</th><th>Current Window</th><th>Window Time</th><th>Duty Cycle</th>"
-                "</tr></thead><tbody>"
-            ).encode('utf-8'))
+            await self._awrite(writer, _CONTROLLERS_H2)
+            await self._awrite(writer, (
+                b"<div class=\"table-responsive\"><div class=\"table-scroll\">"
+                b"<table class=\"pwm-table\"><thead><tr>"
+                b"<th>Name</th><th>Pin</th><th>Status</th><th>Current Window</th><th>Window Time</th><th>Duty Cycle</th>"
+                b"</tr></thead><tbody>"
+            ))
 
             # Populate rows from config (include disabled)
             pwm_pins_cfg = config_dict.get('pwm_pins', {})
@@ -833,16 +772,14 @@ class AsyncWebServer:
                     f"<td>{duty_percent}%</td>"
                     "</tr>"
                 )
-                await self._awrite(client_socket, row.encode('utf-8'))
+                await self._awrite(writer, row.encode('utf-8'))
                 rows_written += 1
 
             if rows_written == 0:
-                await self._awrite(client_socket, b"<tr><td colspan=\"6\" style=\"text-align: center; color: #666;\">No controllers configured</td></tr>")
+                await self._awrite(writer, b"<tr><td colspan=\"6\" style=\"text-align: center; color: #666;\">No controllers configured</td></tr>")
 
             # Close table
-            await self._awrite(client_socket, b"</tbody></table>")
-            await self._awrite(client_socket, b"</div>")
-            await self._awrite(client_socket, b"</div>")
+            await self._awrite(writer, b"</tbody></table></div></div>")
 
             # Footer
             footer_top = (
@@ -853,36 +790,35 @@ class AsyncWebServer:
                 "<div class=\"col\"><a href=\"/restart\">🔄 Restart Device</a></div>"
                 "</div>"
             )
-            await self._awrite(client_socket, footer_top.encode('utf-8'))
-            await self._awrite(client_socket, (
-                "<div style=\"margin-top:8px;font-size:12px;color:#666;\"><small><a href=\"https://github.com/m-anish/PagodaLightPico\" target=\"_blank\" rel=\"noopener\">PagodaLightPico</a></small></div>"
-                "<div class=\"refresh-info\" id=\"refresh-countdown\"></div>"
-                "</div>"
-            ).encode('utf-8'))
-
-            # Close body/html
-            await self._awrite(client_socket, b"</div></body></html>")
+            await self._awrite(writer, footer_top.encode('utf-8'))
+            await self._awrite(writer, (
+                b"<div style=\"margin-top:8px;font-size:12px;color:#666;\"><small><a href=\"https://github.com/m-anish/PagodaLightPico\" target=\"_blank\" rel=\"noopener\">PagodaLightPico</a></small></div>"
+                b"<div class=\"refresh-info\" id=\"refresh-countdown\"></div>"
+                b"</div>"
+                # Close body/html
+                b"</div></body></html>"
+            ))
         except Exception as e:
             log.error(f"[WEB] Error streaming main page: {e}")
             # Best-effort minimal error page so the browser shows something
             try:
-                await self._awrite(client_socket, b"HTTP/1.1 500 Internal Server Error\r\n")
-                await self._awrite(client_socket, b"Content-Type: text/html; charset=utf-8\r\n")
-                await self._awrite(client_socket, b"Connection: close\r\n\r\n")
-                await self._awrite(client_socket, b"<html><body><h1>Server Error</h1><p>Failed to render homepage.</p></body></html>")
+                await self._awrite(writer, b"HTTP/1.1 500 Internal Server Error\r\n")
+                await self._awrite(writer, b"Content-Type: text/html; charset=utf-8\r\n")
+                await self._awrite(writer, b"Connection: close\r\n\r\n")
+                await self._awrite(writer, b"<html><body><h1>Server Error</h1><p>Failed to render homepage.</p></body></html>")
             except Exception:
                 pass
     
-    async def stream_upload_page_chunked(self, client_socket):
+    async def stream_upload_page_chunked(self, writer):
         """Stream the config upload page (chunked upload JS) to minimize RAM usage."""
         try:
             # Send headers without Content-Length
-            await self._awrite(client_socket, b"HTTP/1.1 200 OK\r\n")
-            await self._awrite(client_socket, b"Content-Type: text/html; charset=utf-8\r\n")
-            await self._awrite(client_socket, b"Connection: close\r\n\r\n")
+            await self._awrite(writer, b"HTTP/1.1 200 OK\r\n")
+            await self._awrite(writer, b"Content-Type: text/html; charset=utf-8\r\n")
+            await self._awrite(writer, b"Connection: close\r\n\r\n")
 
             # Head start
-            await self._awrite(client_socket, f"""<!DOCTYPE html>
+            await self._awrite(writer, f"""<!DOCTYPE html>
 <html>
 <head>
     <title>Upload Config - {config.WEB_TITLE}</title>
@@ -948,69 +884,63 @@ class AsyncWebServer:
 <div class=\"container\">""".encode('utf-8'))
 
             # Body content in small chunks
-            await self._awrite(client_socket, b"<h1>Upload Configuration</h1>")
-            await self._awrite(client_socket, b"<div class=\"warning\"><strong>Warning:</strong> Uploading a new configuration will replace the current settings and trigger a restart. Make sure your configuration is valid.</div>")
-            await self._awrite(client_socket, b"<form id=\"uploadForm\">")
-            await self._awrite(client_socket, b"<div class=\"form-group\"><label for=\"configFile\">Select config.json file:</label><input type=\"file\" id=\"configFile\" name=\"config\" accept=\".json\" required></div>")
-            await self._awrite(client_socket, b"<div class=\"form-group\"><button type=\"submit\" class=\"btn\">Upload and Apply</button> <a href=\"/\" class=\"btn btn-secondary\" style=\"text-decoration: none; margin-left: 10px;\">Cancel</a></div>")
-            await self._awrite(client_socket, b"<div id=\"status\"></div><div id=\"result\"></div>")
-            await self._awrite(client_socket, b"</form>")
-            await self._awrite(client_socket, b"<div class=\"footer\"><p><a href=\"/download-config\">Download Current Config</a> | <a href=\"/\">Back to Home</a></p></div>")
-            await self._awrite(client_socket, b"</div></body></html>")
+            await self._awrite(writer, b"<h1>Upload Configuration</h1>")
+            await self._awrite(writer, b"<div class=\"warning\"><strong>Warning:</strong> Uploading a new configuration will replace the current settings and trigger a restart. Make sure your configuration is valid.</div>")
+            await self._awrite(writer, b"<form id=\"uploadForm\">")
+            await self._awrite(writer, b"<div class=\"form-group\"><label for=\"configFile\">Select config.json file:</label><input type=\"file\" id=\"configFile\" name=\"config\" accept=\".json\" required></div>")
+            await self._awrite(writer, b"<div class=\"form-group\"><button type=\"submit\" class=\"btn\">Upload and Apply</button> <a href=\"/\" class=\"btn btn-secondary\" style=\"text-decoration: none; margin-left: 10px;\">Cancel</a></div>")
+            await self._awrite(writer, b"<div id=\"status\"></div><div id=\"result\"></div>")
+            await self._awrite(writer, b"</form>")
+            await self._awrite(writer, b"<div class=\"footer\"><p><a href=\"/download-config\">Download Current Config</a> | <a href=\"/\">Back to Home</a></p></div>")
+            await self._awrite(writer, b"</div></body></html>")
         except Exception as e:
             log.error(f"[WEB] Error streaming upload page: {e}")
 
     def generate_status_json(self):
         """Generate JSON status response."""
         try:
-            import gc
-            current_time = rtc_module.get_current_time()
-            status = system_status.get_status_dict()
+            current_time, status = system_status.get_status_snapshot()
+            if current_time is None:
+                current_time = rtc_module.get_current_time()
             
-            # Sample memory
-            try:
-                gc.collect()
-                mem_free = gc.mem_free()
-                mem_alloc = gc.mem_alloc() if hasattr(gc, 'mem_alloc') else None
-            except Exception:
-                mem_free = None
-                mem_alloc = None
-
-            data = {
-                'timestamp': time.time(),
-                'current_time': {
-                    'hour': current_time[3],
-                    'minute': current_time[4],
-                    'second': current_time[5],
-                    'day': current_time[2],
-                    'month': current_time[1],
-                    'year': current_time[0]
-                },
-                'memory': {
-                    'free': mem_free,
-                    'alloc': mem_alloc
-                }
-            }
-            # Merge the status dictionary into data
-            data.update(status)
-            
-            json_str = json.dumps(data)
-            body = json_str.encode('utf-8')
-            response = (
-                "HTTP/1.1 200 OK\r\n"
-                "Content-Type: application/json; charset=utf-8\r\n"
-                f"Content-Length: {len(body)}\r\n"
-                "Connection: close\r\n\r\n"
-            ) + json_str
-            return response
+            # system_status rebuilds its dict at most once per TTL (or on a state
+            # change); until then the JSON serialized from it is served again
+            if status is not self._status_src:
+                self._status_body = json.dumps(self._fill_status_doc(current_time, status)).encode('utf-8')
+                self._status_src = status
+            return self._http_response("200 OK", self._status_body, "application/json; charset=utf-8")
             
         except Exception as e:
             log.error(f"[WEB] Error generating status JSON: {e}")
             return self.generate_500()
     
+    def _fill_status_doc(self, current_time, status):
+        """Refresh the reusable /status document in place and return it."""
+        doc = self._status_doc
+        # Sample memory
+        mem_free = gc.mem_free()
+        if mem_free < _GC_LOW_WATER:
+            gc.collect()
+            mem_free = gc.mem_free()
+        memory = doc['memory']
+        memory['free'] = mem_free
+        memory['alloc'] = gc.mem_alloc()
+
+        doc['timestamp'] = time.time()
+        clock = doc['current_time']
+        clock['hour'] = current_time[3]
+        clock['minute'] = current_time[4]
+        clock['second'] = current_time[5]
+        clock['day'] = current_time[2]
+        clock['month'] = current_time[1]
+        clock['year'] = current_time[0]
+        # Merge the status dictionary into the document
+        doc.update(status)
+        return doc
+
     def generate_404(self):
         """Generate 404 response."""
-        html = """<!DOCTYPE html>
+        html = b"""<!DOCTYPE html>
 <html>
 <head><title>404 Not Found</title></head>
 <body>
@@ -1018,18 +948,12 @@ class AsyncWebServer:
     <p><a href="/">Back to Home</a></p>
 </body>
 </html>"""
-        body = html.encode('utf-8')
-        response = (
-            "HTTP/1.1 404 Not Found\r\n"
-            "Content-Type: text/html; charset=utf-8\r\n"
-            f"Content-Length: {len(body)}\r\n"
-            "Connection: close\r\n\r\n"
-        ) + html
+        response = self._http_response("404 Not Found", html)
         return response
     
     def generate_500(self):
         """Generate 500 response."""
-        html = """<!DOCTYPE html>
+        html = b"""<!DOCTYPE html>
 <html>
 <head><title>500 Server Error</title></head>
 <body>
@@ -1037,13 +961,7 @@ class AsyncWebServer:
     <p><a href="/">Back to Home</a></p>
 </body>
 </html>"""
-        body = html.encode('utf-8')
-        response = (
-            "HTTP/1.1 500 Internal Server Error\r\n"
-            "Content-Type: text/html; charset=utf-8\r\n"
-            f"Content-Length: {len(body)}\r\n"
-            "Connection: close\r\n\r\n"
-        ) + html
+        response = self._http_response("500 Internal Server Error", html)
         return response
 
     def generate_restart_page(self):
@@ -1087,13 +1005,7 @@ class AsyncWebServer:
     </div>
 </body>
 </html>"""
-            body = html.encode('utf-8')
-            response = (
-                "HTTP/1.1 200 OK\r\n"
-                "Content-Type: text/html; charset=utf-8\r\n"
-                f"Content-Length: {len(body)}\r\n"
-                "Connection: close\r\n\r\n"
-            ) + html
+            response = self._http_response("200 OK", html)
             return response
         except Exception as e:
             log.error(f"[WEB] Error generating restart page: {e}")
@@ -1103,18 +1015,11 @@ class AsyncWebServer:
         """Generate config.json download response."""
         try:
             # Read current config file
-            with open('config.json', 'r') as f:
+            with open('config.json', 'rb') as f:
                 config_content = f.read()
             
             # Generate download response with proper headers
-            body = config_content.encode('utf-8')
-            response = (
-                "HTTP/1.1 200 OK\r\n"
-                "Content-Type: application/json; charset=utf-8\r\n"
-                "Content-Disposition: attachment; filename=\"config.json\"\r\n"
-                f"Content-Length: {len(body)}\r\n"
-                "Connection: close\r\n\r\n"
-            ) + config_content
+            response = self._http_response("200 OK", config_content, "application/json; charset=utf-8", 'Content-Disposition: attachment; filename="config.json"\r\n')
             return response
             
         except Exception as e:
@@ -1125,18 +1030,11 @@ class AsyncWebServer:
         """Generate sun_times.json download response."""
         try:
             # Read current sun_times file
-            with open('sun_times.json', 'r') as f:
+            with open('sun_times.json', 'rb') as f:
                 sun_times_content = f.read()
 
             # Generate download response with proper headers
-            body = sun_times_content.encode('utf-8')
-            response = (
-                "HTTP/1.1 200 OK\r\n"
-                "Content-Type: application/json; charset=utf-8\r\n"
-                "Content-Disposition: attachment; filename=\"sun_times.json\"\r\n"
-                f"Content-Length: {len(body)}\r\n"
-                "Connection: close\r\n\r\n"
-            ) + sun_times_content
+            response = self._http_response("200 OK", sun_times_content, "application/json; charset=utf-8", 'Content-Disposition: attachment; filename="sun_times.json"\r\n')
             return response
 
         except Exception as e:
@@ -1194,13 +1092,7 @@ class AsyncWebServer:
 </body>
 </html>"""
             
-            body = html.encode('utf-8')
-            response = (
-                "HTTP/1.1 200 OK\r\n"
-                "Content-Type: text/html; charset=utf-8\r\n"
-                f"Content-Length: {len(body)}\r\n"
-                "Connection: close\r\n\r\n"
-            ) + html
+            response = self._http_response("200 OK", html)
             return response
             
         except Exception as e:
@@ -1323,13 +1215,7 @@ class AsyncWebServer:
     </script>
     </html>"""
             
-            body = html.encode('utf-8')
-            response = (
-                "HTTP/1.1 200 OK\r\n"
-                "Content-Type: text/html; charset=utf-8\r\n"
-                f"Content-Length: {len(body)}\r\n"
-                "Connection: close\r\n\r\n"
-            ) + html
+            response = self._http_response("200 OK", html)
             return response
             
         except Exception as e:
@@ -1339,18 +1225,25 @@ class AsyncWebServer:
     def _tmp_config_path(self):
         return 'config.json.upload'
 
+    def _http_response(self, status, body, content_type='text/html; charset=utf-8', extra_headers=''):
+        """Build a (header_bytes, body_bytes) pair; handle_client writes the two parts in turn."""
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        header = (
+            f"HTTP/1.1 {status}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"{extra_headers}"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n"
+        )
+        return header.encode('utf-8'), body
+
     def _json_response(self, status_code, obj):
         try:
             s = json.dumps(obj)
         except Exception:
             s = '{}'
-        body = s.encode('utf-8')
-        return (
-            f"HTTP/1.1 {status_code} OK\r\n"
-            "Content-Type: application/json; charset=utf-8\r\n"
-            f"Content-Length: {len(body)}\r\n"
-            "Connection: close\r\n\r\n"
-        ) + s
+        return self._http_response(f"{status_code} OK", s, "application/json; charset=utf-8")
 
     def handle_config_upload_begin(self):
         """Begin chunked upload: create/truncate temp file."""
@@ -1367,7 +1260,7 @@ class AsyncWebServer:
             log.error(f"[WEB] upload-begin error: {e}")
             return self._json_response(500, { 'ok': False, 'error': 'begin failed' })
 
-    def handle_config_upload_chunk(self, body_bytes, headers_text):
+    def handle_config_upload_chunk(self, body_bytes):
         """Append a binary chunk to temp file."""
         try:
             # Basic safety: ensure temp exists
@@ -1385,7 +1278,7 @@ class AsyncWebServer:
             log.error(f"[WEB] upload-chunk error: {e}")
             return self._json_response(500, { 'ok': False, 'error': 'chunk failed' })
 
-    async def handle_config_upload_finalize(self, request_str):
+    async def handle_config_upload_finalize(self):
         """Validate temp config and replace current config.json; then show restart page."""
         try:
             # Read uploaded file
@@ -1540,13 +1433,7 @@ class AsyncWebServer:
                 # Schedule soft reboot after response is sent
                 asyncio.create_task(self.soft_reboot_delayed())
                 
-                body = html.encode('utf-8')
-                response = (
-                    "HTTP/1.1 200 OK\r\n"
-                    "Content-Type: text/html; charset=utf-8\r\n"
-                    f"Content-Length: {len(body)}\r\n"
-                    "Connection: close\r\n\r\n"
-                ) + html
+                response = self._http_response("200 OK", html)
                 return response
                 
             except Exception as e:
@@ -1585,23 +1472,17 @@ class AsyncWebServer:
 </body>
 </html>"""
         
-        body = html.encode('utf-8')
-        response = (
-            "HTTP/1.1 400 Bad Request\r\n"
-            "Content-Type: text/html; charset=utf-8\r\n"
-            f"Content-Length: {len(body)}\r\n"
-            "Connection: close\r\n\r\n"
-        ) + html
+        response = self._http_response("400 Bad Request", html)
         return response
     
-    async def stream_upload_sun_times_page_chunked(self, client_socket):
+    async def stream_upload_sun_times_page_chunked(self, writer):
         """Stream the sun_times upload page with chunked JS upload to reduce RAM."""
         try:
-            await self._awrite(client_socket, b"HTTP/1.1 200 OK\r\n")
-            await self._awrite(client_socket, b"Content-Type: text/html; charset=utf-8\r\n")
-            await self._awrite(client_socket, b"Connection: close\r\n\r\n")
+            await self._awrite(writer, b"HTTP/1.1 200 OK\r\n")
+            await self._awrite(writer, b"Content-Type: text/html; charset=utf-8\r\n")
+            await self._awrite(writer, b"Connection: close\r\n\r\n")
 
-            await self._awrite(client_socket, f"""<!DOCTYPE html>
+            await self._awrite(writer, f"""<!DOCTYPE html>
 <html>
 <head>
     <title>Upload Sun Times - {config.WEB_TITLE}</title>
@@ -1665,15 +1546,15 @@ class AsyncWebServer:
 <body>
 <div class=\"container\">""".encode('utf-8'))
 
-            await self._awrite(client_socket, b"<h1>Upload Sun Times</h1>")
-            await self._awrite(client_socket, b"<div class=\"warning\"><strong>Note:</strong> Uploading a new sun_times.json replaces the current sunrise/sunset schedule without restarting.</div>")
-            await self._awrite(client_socket, b"<form id=\"uploadForm\">")
-            await self._awrite(client_socket, b"<div class=\"form-group\"><label for=\"sunFile\">Select sun_times.json file:</label><input type=\"file\" id=\"sunFile\" name=\"sun_times\" accept=\".json\" required></div>")
-            await self._awrite(client_socket, b"<div class=\"form-group\"><button type=\"submit\" class=\"btn\">Upload</button> <a href=\"/\" class=\"btn btn-secondary\" style=\"text-decoration: none; margin-left: 10px;\">Cancel</a></div>")
-            await self._awrite(client_socket, b"<div id=\"status\"></div><div id=\"result\"></div>")
-            await self._awrite(client_socket, b"</form>")
-            await self._awrite(client_socket, b"<div class=\"footer\"><p><a href=\"/download-sun-times\">Download Current Sun Times</a> | <a href=\"/\">Back to Home</a></p></div>")
-            await self._awrite(client_socket, b"</div></body></html>")
+            await self._awrite(writer, b"<h1>Upload Sun Times</h1>")
+            await self._awrite(writer, b"<div class=\"warning\"><strong>Note:</strong> Uploading a new sun_times.json replaces the current sunrise/sunset schedule without restarting.</div>")
+            await self._awrite(writer, b"<form id=\"uploadForm\">")
+            await self._awrite(writer, b"<div class=\"form-group\"><label for=\"sunFile\">Select sun_times.json file:</label><input type=\"file\" id=\"sunFile\" name=\"sun_times\" accept=\".json\" required></div>")
+            await self._awrite(writer, b"<div class=\"form-group\"><button type=\"submit\" class=\"btn\">Upload</button> <a href=\"/\" class=\"btn btn-secondary\" style=\"text-decoration: none; margin-left: 10px;\">Cancel</a></div>")
+            await self._awrite(writer, b"<div id=\"status\"></div><div id=\"result\"></div>")
+            await self._awrite(writer, b"</form>")
+            await self._awrite(writer, b"<div class=\"footer\"><p><a href=\"/download-sun-times\">Download Current Sun Times</a> | <a href=\"/\">Back to Home</a></p></div>")
+            await self._awrite(writer, b"</div></body></html>")
         except Exception as e:
             log.error(f"[WEB] Error streaming sun times upload page: {e}")
 
@@ -1694,7 +1575,7 @@ class AsyncWebServer:
             log.error(f"[WEB] sun-begin error: {e}")
             return self._json_response(500, { 'ok': False, 'error': 'begin failed' })
 
-    def handle_sun_times_upload_chunk(self, body_bytes, headers_text):
+    def handle_sun_times_upload_chunk(self, body_bytes):
         """Append a chunk to temporary sun_times upload file."""
         try:
             with open(self._tmp_sun_times_path(), 'ab') as f:
@@ -1754,17 +1635,14 @@ class AsyncWebServer:
                 except Exception:
                     pass
 
+            # Pick up the new schedule (and location) on the next lookup
+            sun_times.reload()
+
             # Success page (no restart needed)
             html = """<!DOCTYPE html>
 <html><head><title>Sun Times Updated</title><meta name=\"viewport\" content=\"width=device-width, initial-scale=1\"></head>
 <body><div class=\"container\"><h1>Sun Times Updated</h1><p>sun_times.json has been updated successfully.</p><p><a href=\"/\">Back to Home</a></p></div></body></html>"""
-            body = html.encode('utf-8')
-            return (
-                "HTTP/1.1 200 OK\r\n"
-                "Content-Type: text/html; charset=utf-8\r\n"
-                f"Content-Length: {len(body)}\r\n"
-                "Connection: close\r\n\r\n"
-            ) + html
+            return self._http_response("200 OK", html)
         except Exception as e:
             log.error(f"[WEB] sun-finalize error: {e}")
             try:
@@ -1775,13 +1653,7 @@ class AsyncWebServer:
             html = f"""<!DOCTYPE html>
 <html><head><title>Sun Times Upload Error</title><meta name=\"viewport\" content=\"width=device-width, initial-scale=1\"></head>
 <body><div class=\"container\"><h1>Upload Failed</h1><p><strong>Error:</strong> {err}</p><p><a href=\"/upload-sun-times\">Try Again</a> | <a href=\"/\">Home</a></p></div></body></html>"""
-            body = html.encode('utf-8')
-            return (
-                "HTTP/1.1 400 Bad Request\r\n"
-                "Content-Type: text/html; charset=utf-8\r\n"
-                f"Content-Length: {len(body)}\r\n"
-                "Connection: close\r\n\r\n"
-            ) + html
+            return self._http_response("400 Bad Request", html)
     
     async def handle_sun_times_upload(self, request_str):
         """Handle sun_times.json file upload and validation."""
@@ -1879,7 +1751,7 @@ class AsyncWebServer:
                 # Schedule soft reboot after response is sent
                 asyncio.create_task(self.soft_reboot_delayed())
                 
-                response = f"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\nContent-Length: {len(html)}\r\nConnection: close\r\n\r\n{html}"
+                response = self._http_response("200 OK", html)
                 return response
                 
             except Exception as e:
@@ -1913,7 +1785,7 @@ class AsyncWebServer:
         Raises ValueError if the running config has no valid major.minor version.
         """
         try:
-            current_ver = str(config.config_manager.get_config_dict().get('version', '')).strip()
+            current_ver = str(config.config_manager.get_config_view().get('version', '')).strip()
             if not current_ver:
                 raise ValueError("Running config has no 'version'.")
             mm = self._major_minor(current_ver)
@@ -1928,7 +1800,7 @@ class AsyncWebServer:
         """Validate basic structure of sun_times.json data."""
         try:
             # Check required top-level fields
-            required_fields = ['location', 'lat', 'lon', 'days']
+            required_fields = ('location', 'lat', 'lon', 'days')
             for field in required_fields:
                 if field not in data:
                     return False
@@ -1941,8 +1813,13 @@ class AsyncWebServer:
             if not isinstance(data['lat'], (int, float)) or not isinstance(data['lon'], (int, float)):
                 return False
             
-            # Check a few day entries have proper format
-            for date_key, day_data in list(data['days'].items())[:3]:  # Check first 3 entries
+            # Check a few day entries have proper format (first 3, without
+            # materializing the whole days map as a list)
+            checked = 0
+            for day_data in data['days'].values():
+                if checked == 3:
+                    break
+                checked += 1
                 if not isinstance(day_data, dict):
                     return False
                 if 'rise' not in day_data or 'set' not in day_data:
@@ -1984,7 +1861,7 @@ class AsyncWebServer:
 </body>
 </html>"""
         
-        response = f"HTTP/1.1 400 Bad Request\r\nContent-Type: text/html\r\nContent-Length: {len(html)}\r\nConnection: close\r\n\r\n{html}"
+        response = self._http_response("400 Bad Request", html)
         return response
 
     async def soft_reboot_delayed(self):
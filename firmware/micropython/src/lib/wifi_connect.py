@@ -16,7 +16,7 @@ from lib.config_manager import WIFI_SSID, WIFI_PASSWORD, TIMEZONE_OFFSET, config
 from machine import Pin
 import urtc
 from simple_logger import Logger
-from lib.rtc_shared import rtc
+from lib.rtc_shared import get_rtc
 
 # For Pico W, the onboard LED is on "LED" pin, not GPIO 25
 try:
@@ -25,6 +25,27 @@ except:
     led = Pin(25, Pin.OUT)  # Fallback for regular Pico
 log = Logger()
 
+_wlan = None
+
+# Capabilities of this port/firmware. _has_rssi is None until probed (it
+# needs a connected interface) and only turns False when the port reports
+# the query as unsupported, not on a transient failure.
+_HAS_HOSTNAME = hasattr(network, "hostname")
+_has_rssi = None
+
+
+def get_wlan():
+    """
+    Return the station interface, created once and reused.
+
+    Returns:
+        network.WLAN: The STA_IF interface
+    """
+    global _wlan
+    if _wlan is None:
+        _wlan = network.WLAN(network.STA_IF)
+    return _wlan
+
 
 def connect_wifi(timeout=10, max_attempts=3):
     """
@@ -37,14 +58,15 @@ def connect_wifi(timeout=10, max_attempts=3):
     Returns:
         bool: True if connected, False on failure after all attempts.
     """
-    wlan = network.WLAN(network.STA_IF)
+    wlan = get_wlan()
     wlan.active(True)
     
-    # Set hostname from config
-    hostname = config_manager.get_config_dict().get('hostname', 'PagodaLightPico')
+    # Set hostname from config; reconnects leave an unchanged name alone
+    hostname = config_manager.get_config_view().get('hostname', 'PagodaLightPico')
     try:
-        network.hostname(hostname)
-        log.debug(f"[WIFI] Set network hostname to: {hostname}")
+        if network.hostname() != hostname:
+            network.hostname(hostname)
+            log.debug(f"[WIFI] Set network hostname to: {hostname}")
     except Exception as e:
         log.warn(f"[WIFI] Failed to set hostname: {e}")
     
@@ -52,10 +74,11 @@ def connect_wifi(timeout=10, max_attempts=3):
     if wlan.isconnected():
         ip_info = wlan.ifconfig()
         log.info(f"[WIFI] Already connected, IP: {ip_info[0]}")
-        log.debug(f"[WIFI] Network Details:")
-        log.debug(f"[WIFI]   Subnet Mask: {ip_info[1]}")
-        log.debug(f"[WIFI]   Gateway: {ip_info[2]}")
-        log.debug(f"[WIFI]   DNS Server: {ip_info[3]}")
+        if log.debug_enabled:
+            log.debug("[WIFI] Network Details:")
+            log.debug(f"[WIFI]   Subnet Mask: {ip_info[1]}")
+            log.debug(f"[WIFI]   Gateway: {ip_info[2]}")
+            log.debug(f"[WIFI]   DNS Server: {ip_info[3]}")
         log.info(f"[WIFI] Web interface: http://{ip_info[0]}/")
         led.value(1)  # LED ON when connected
         return True
@@ -79,10 +102,11 @@ def connect_wifi(timeout=10, max_attempts=3):
             if wlan.isconnected():
                 ip_info = wlan.ifconfig()
                 log.info(f"[WIFI] Connected (attempt {attempt}), IP: {ip_info[0]}")
-                log.debug(f"[WIFI] Network Details:")
-                log.debug(f"[WIFI]   Subnet Mask: {ip_info[1]}")
-                log.debug(f"[WIFI]   Gateway: {ip_info[2]}")
-                log.debug(f"[WIFI]   DNS Server: {ip_info[3]}")
+                if log.debug_enabled:
+                    log.debug("[WIFI] Network Details:")
+                    log.debug(f"[WIFI]   Subnet Mask: {ip_info[1]}")
+                    log.debug(f"[WIFI]   Gateway: {ip_info[2]}")
+                    log.debug(f"[WIFI]   DNS Server: {ip_info[3]}")
                 log.info(f"[WIFI] Web interface: http://{ip_info[0]}/")
                 led.value(1)  # LED ON when connected
                 return True
@@ -108,7 +132,8 @@ def get_network_status():
     Returns:
         dict: Network status information including connection state, IP, etc.
     """
-    wlan = network.WLAN(network.STA_IF)
+    global _has_rssi
+    wlan = get_wlan()
     
     if not wlan.active():
         return {
@@ -126,21 +151,27 @@ def get_network_status():
     
     # Get hostname if available
     hostname = None
-    try:
-        hostname = network.hostname()
-    except:
-        pass
+    if _HAS_HOSTNAME:
+        try:
+            hostname = network.hostname()
+        except Exception:
+            pass
     
     # Get signal strength if connected
     signal_strength = None
-    if connected:
+    if connected and _has_rssi is not False:
         try:
             signal_strength = wlan.status('rssi')
-        except:
+            _has_rssi = True
+        except (AttributeError, ValueError, TypeError):
+            # Unsupported on this port/firmware: stop asking
+            _has_rssi = False
+        except Exception:
+            # Transient failure: no reading this time, ask again next call
             pass
     
     return {
-        "active": wlan.active(),
+        "active": True,
         "connected": connected,
         "hostname": hostname,
         "ip": ip_info[0],
@@ -198,15 +229,18 @@ def sync_time_ntp():
 
         # Convert to tuple compatible with urtc DS3231 datetime
         dt_tuple = urtc.seconds2tuple(local_sec)
-        log.debug(f"[NTP] Converted local time tuple for DS3231: {dt_tuple}")
+        if log.debug_enabled:
+            log.debug(f"[NTP] Converted local time tuple for DS3231: {dt_tuple}")
 
         # Write corrected time to DS3231 RTC
+        rtc = get_rtc()
         rtc.datetime(dt_tuple)
         log.info("[NTP] DS3231 RTC datetime updated successfully with local time")
 
-        # Verify by reading back from DS3231 RTC
-        readback = rtc.datetime()
-        log.debug(f"[NTP] RTC datetime read back for verification: {readback}")
+        # Verify by reading back from DS3231 RTC (an extra I2C read, debug only)
+        if log.debug_enabled:
+            readback = rtc.datetime()
+            log.debug(f"[NTP] RTC datetime read back for verification: {readback}")
 
         return True
     except Exception as e:
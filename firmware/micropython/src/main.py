@@ -35,11 +35,11 @@ from lib import config_manager as config
 from lib import sun_times
 import rtc_module
 from simple_logger import Logger
-from lib.wifi_connect import connect_wifi, sync_time_ntp
+from lib.wifi_connect import connect_wifi, sync_time_ntp, get_wlan
 import time
 from lib.pwm_control import multi_pwm
 from lib.web_server import web_server
-from lib.mqtt_notifier import mqtt_notifier
+from lib.mqtt_notifier import get_notifier
 from lib.system_status import system_status
 
 log = Logger()
@@ -62,7 +62,7 @@ if wifi_connected:
     # Web server will be started in the async main() function
     
     # Connect MQTT if enabled
-    if mqtt_notifier.connect():
+    if get_notifier().connect():
         log.info("MQTT connected successfully")
         system_status.set_connection_status(mqtt=True)
     else:
@@ -99,6 +99,44 @@ def _get_today_rise_set(current_time_tuple):
         log.error(f"Error caching sunrise/sunset: {e}")
         return None, None
 
+def _placeholder(value):
+    """
+    Return 'sunrise' or 'sunset' if value is that placeholder, else None.
+
+    Exact lowercase spellings match without allocating; only other strings
+    are normalized with strip().lower().
+    """
+    if value == 'sunrise' or value == 'sunset':
+        return value
+    if not isinstance(value, str) or ':' in value:
+        return None
+    value = value.strip().lower()
+    if value == 'sunrise' or value == 'sunset':
+        return value
+    return None
+
+def _to_minutes(time_str):
+    """
+    Convert 'HH:MM' or 'H:MM' to minutes since midnight.
+
+    Digits are checked and converted by character code, so malformed
+    strings return -1 instead of raising. Surrounding whitespace is
+    ignored, as config validation accepts it.
+    """
+    n = len(time_str)
+    if (n != 4 and n != 5) or time_str[0] <= ' ' or time_str[-1] <= ' ':
+        time_str = time_str.strip()
+        n = len(time_str)
+    if (n != 4 and n != 5) or time_str[n - 3] != ':':
+        return -1
+    h1 = ord(time_str[0]) - 48 if n == 5 else 0
+    h2 = ord(time_str[n - 4]) - 48
+    m1 = ord(time_str[n - 2]) - 48
+    m2 = ord(time_str[n - 1]) - 48
+    if not (0 <= h1 <= 9 and 0 <= h2 <= 9 and 0 <= m1 <= 5 and 0 <= m2 <= 9):
+        return -1
+    return (h1 * 10 + h2) * 60 + m1 * 10 + m2
+
 def get_current_window_for_pin(pin_config):
     """
     Determine which time window is currently active for a specific pin.
@@ -126,15 +164,15 @@ def get_current_window_for_pin(pin_config):
                 continue
             # shallow copy
             wc = dict(window_cfg)
-            s = wc.get('start')
-            e = wc.get('end')
-            if isinstance(s, str) and rise_str is not None and s.strip().lower() == 'sunrise':
+            s = _placeholder(wc.get('start'))
+            e = _placeholder(wc.get('end'))
+            if s == 'sunrise' and rise_str is not None:
                 wc['start'] = rise_str
-            if isinstance(s, str) and set_str is not None and s.strip().lower() == 'sunset':
+            elif s == 'sunset' and set_str is not None:
                 wc['start'] = set_str
-            if isinstance(e, str) and rise_str is not None and e.strip().lower() == 'sunrise':
+            if e == 'sunrise' and rise_str is not None:
                 wc['end'] = rise_str
-            if isinstance(e, str) and set_str is not None and e.strip().lower() == 'sunset':
+            elif e == 'sunset' and set_str is not None:
                 wc['end'] = set_str
             resolved_windows[window_name] = wc
         
@@ -149,28 +187,24 @@ def get_current_window_for_pin(pin_config):
             if not start_str or not end_str:
                 continue
             
-            try:
-                # Ensure strings are in HH:MM format after resolution
-                if not (isinstance(start_str, str) and isinstance(end_str, str)):
-                    continue
-                if ':' not in start_str or ':' not in end_str:
-                    continue
-                start_parts = start_str.split(':')
-                end_parts = end_str.split(':')
-                start_minutes = int(start_parts[0]) * 60 + int(start_parts[1])
-                end_minutes = int(end_parts[0]) * 60 + int(end_parts[1])
-                
-                # Handle overnight windows (e.g., 22:00 to 06:00)
-                if start_minutes > end_minutes:
-                    if current_minutes_since_midnight >= start_minutes or current_minutes_since_midnight < end_minutes:
-                        return window_name, window_config
-                else:
-                    if start_minutes <= current_minutes_since_midnight < end_minutes:
-                        return window_name, window_config
-                        
-            except (ValueError, IndexError) as e:
-                log.error(f"Invalid time format in window {window_name}: {e}")
+            # Ensure strings are in HH:MM format after resolution
+            if not (isinstance(start_str, str) and isinstance(end_str, str)):
                 continue
+            if ':' not in start_str or ':' not in end_str:
+                continue  # unresolved sunrise/sunset placeholder
+            start_minutes = _to_minutes(start_str)
+            end_minutes = _to_minutes(end_str)
+            if start_minutes < 0 or end_minutes < 0:
+                log.error(f"Invalid time format in window {window_name}: {start_str} - {end_str}")
+                continue
+            
+            # Handle overnight windows (e.g., 22:00 to 06:00)
+            if start_minutes > end_minutes:
+                if current_minutes_since_midnight >= start_minutes or current_minutes_since_midnight < end_minutes:
+                    return window_name, window_config
+            else:
+                if start_minutes <= current_minutes_since_midnight < end_minutes:
+                    return window_name, window_config
         
         return None, None
         
@@ -178,39 +212,62 @@ def get_current_window_for_pin(pin_config):
         log.error(f"Error determining current window: {e}")
         return None, None
 
+# Enabled pins as (pin_key, pin_config, name) tuples, rebuilt only when the
+# config revision changes instead of re-filtering pwm_pins on every tick
+_enabled_pins = ()
+_enabled_pins_rev = -1
+
+def _get_enabled_pins():
+    """
+    Return the enabled, well-formed PWM pin entries from the configuration.
+
+    Returns:
+        tuple: (pin_key, pin_config, pin_name) for each enabled pin
+    """
+    global _enabled_pins, _enabled_pins_rev
+    manager = config.config_manager
+    rev = manager.config_rev
+    if rev == _enabled_pins_rev:
+        return _enabled_pins
+
+    pins = []
+    pwm_pins = manager.get_config_view().get('pwm_pins', {})
+    for pin_key, pin_config in pwm_pins.items():
+        if pin_key.startswith('_'):
+            continue  # Skip comment entries
+        
+        if not isinstance(pin_config, dict):
+            log.error(f"Invalid pin config for {pin_key}: expected dict, got {type(pin_config)}")
+            continue
+        
+        enabled = pin_config.get('enabled', False)
+        if not enabled:
+            continue
+        
+        gpio_pin = pin_config.get('gpio_pin')
+        if gpio_pin is None:
+            log.error(f"No GPIO pin specified for {pin_key}")
+            continue
+        
+        pins.append((pin_key, pin_config, pin_config.get('name', f'Pin {gpio_pin}')))
+
+    _enabled_pins = tuple(pins)
+    _enabled_pins_rev = rev
+    return _enabled_pins
+
 async def update_pwm_pins():
     """
     Async task to update PWM pins based on current time windows.
     """
     try:
-        config_data = config.config_manager.get_config_dict()
-        pwm_pins = config_data.get('pwm_pins', {})
-        
         pin_updates = {}
         
-        for pin_key, pin_config in pwm_pins.items():
-            if pin_key.startswith('_'):
-                continue  # Skip comment entries
-            
-            if not isinstance(pin_config, dict):
-                log.error(f"Invalid pin config for {pin_key}: expected dict, got {type(pin_config)}")
-                continue
-            
-            enabled = pin_config.get('enabled', False)
-            if not enabled:
-                continue
-            
-            gpio_pin = pin_config.get('gpio_pin')
-            if gpio_pin is None:
-                log.error(f"No GPIO pin specified for {pin_key}")
-                continue
-            
+        for pin_key, pin_config, pin_name in _get_enabled_pins():
             # Get current active window
             window_name, window_config = get_current_window_for_pin(pin_config)
             
             if window_config:
                 duty_cycle = window_config.get('duty_cycle', 0)
-                pin_name = pin_config.get('name', f'Pin {gpio_pin}')
                 
                 # Update PWM using pin_key instead of gpio_pin
                 multi_pwm.set_pin_duty_percent(pin_key, duty_cycle)
@@ -221,25 +278,30 @@ async def update_pwm_pins():
                     'window': window_name,
                     'duty_cycle': duty_cycle,
                     'window_start': window_config.get('start'),
-                    'window_end': window_config.get('end')
+                    'window_end': window_config.get('end'),
+                    'gpio_pin': pin_config['gpio_pin']
                 }
         
         # Update system status with pin information
         if pin_updates:
             system_status.update_multi_pin_status(pin_updates)
-            active_pins = sum(1 for update in pin_updates.values() if update.get('duty_cycle', 0) > 0)
-            log.debug(f"[PWM_UPDATE] Updated {len(pin_updates)} pins, {active_pins} active")
+            if log.debug_enabled:
+                active_pins = sum(1 for update in pin_updates.values() if update.get('duty_cycle', 0) > 0)
+                log.debug(f"[PWM_UPDATE] Updated {len(pin_updates)} pins, {active_pins} active")
             
-            if mqtt_notifier.connected:
-                mqtt_notifier.notify_multi_pin_changes(pin_updates)
+            # Sent while disconnected too: the notifier queues until reconnect
+            notifier = get_notifier()
+            if notifier.notifications_enabled:
+                notifier.notify_multi_pin_changes(pin_updates)
         else:
             log.debug("[PWM_UPDATE] No pin updates needed")
             
     except Exception as e:
         error_msg = f"Error updating PWM pins: {e}"
         log.error(error_msg)
-        if mqtt_notifier.connected:
-            mqtt_notifier.notify_error(error_msg)
+        notifier = get_notifier()
+        if notifier.notifications_enabled:
+            notifier.notify_error(error_msg)
 
 async def pwm_update_task():
     """
@@ -250,7 +312,8 @@ async def pwm_update_task():
     
     while True:
         try:
-            log.debug(f"[PWM_TASK] Performing PWM update (interval: {update_interval}s)")
+            if log.debug_enabled:
+                log.debug(f"[PWM_TASK] Performing PWM update (interval: {update_interval}s)")
             await update_pwm_pins()
             await asyncio.sleep(update_interval)
         except Exception as e:
@@ -274,9 +337,7 @@ async def network_monitor_task():
             # Periodic network health check
             if elapsed >= network_check_interval:
                 try:
-                    import network
-                    wlan = network.WLAN(network.STA_IF)
-                    if not wlan.isconnected():
+                    if not get_wlan().isconnected():
                         log.warn("[NETWORK] WiFi connection lost, attempting reconnection...")
                         system_status.set_connection_status(wifi=False, web_server=False, mqtt=False)
                         # Try to reconnect
@@ -291,14 +352,16 @@ async def network_monitor_task():
                                 else:
                                     log.error("[NETWORK] Failed to restart web server")
                             # Reconnect MQTT if needed
-                            if not mqtt_notifier.connected:
-                                if mqtt_notifier.connect():
+                            notifier = get_notifier()
+                            if not notifier.connected:
+                                if notifier.connect():
                                     system_status.set_connection_status(mqtt=True)
                     else:
                         # Check MQTT connection health
-                        if mqtt_notifier.notifications_enabled and not mqtt_notifier.connected:
+                        notifier = get_notifier()
+                        if notifier.notifications_enabled and not notifier.connected:
                             log.debug("[NETWORK] MQTT disconnected, attempting reconnection...")
-                            if mqtt_notifier.connect():
+                            if notifier.connect():
                                 system_status.set_connection_status(mqtt=True)
                                 log.info("[NETWORK] MQTT reconnected successfully")
                     
@@ -307,6 +370,9 @@ async def network_monitor_task():
                     log.error(f"[NETWORK] Network health check error: {e}")
                     last_network_check = current_time
             
+            # Keep the MQTT session alive between notifications
+            get_notifier().keepalive()
+            
             # Sleep until the next check window (clamped to avoid very long sleeps)
             now = time.time()
             remaining = network_check_interval - (now - last_network_check)